@@ -19,6 +19,10 @@ class Settings(BaseSettings):
     face_model_name: str = "buffalo_l"
     face_swap_model: str = "inswapper_128.onnx"
 
+    # TensorRT settings (used when onnxruntime exposes the TensorRT provider)
+    trt_engine_cache_dir: str = "models/trt_cache"
+    trt_int8_calibration_table: str = "models/calibration.flatbuffers"
+
     # API settings
     max_file_size: int = 10 * 1024 * 1024  # 10MB
     allowed_extensions: list = [".jpg", ".jpeg", ".png", ".webp"]
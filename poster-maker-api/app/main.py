@@ -7,7 +7,7 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, UploadFile, File, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 
 from app.config import get_settings
 from app.models import (
@@ -132,6 +132,23 @@ async def get_job_status(job_id: str):
     return result
 
 
+@app.get("/job/{job_id}/events")
+async def stream_job_status(job_id: str):
+    """Stream generation progress as Server-Sent Events."""
+    if not face_swap_service.get_job_status(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events():
+        async for status in face_swap_service.subscribe(job_id):
+            yield f"data: {status.model_dump_json()}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
 @app.get("/celebrities", response_model=CelebritiesResponse)
 async def get_celebrities(
     category: CelebrityCategory = Query(None, description="Filter by category")
@@ -4,8 +4,11 @@ import os
 import uuid
 import logging
 import math
+import itertools
+import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
 import asyncio
 import random
 
@@ -13,6 +16,19 @@ import cv2
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageEnhance
 
+try:
+    import onnxruntime as ort
+    from insightface.app import FaceAnalysis
+    INSIGHTFACE_AVAILABLE = True
+except ImportError:
+    INSIGHTFACE_AVAILABLE = False
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 from app.config import get_settings
 from app.models import (
     Celebrity, Template, SceneType, CelebrityCategory,
@@ -22,6 +38,97 @@ from app.models import (
 logger = logging.getLogger(__name__)
 
 
+# ============================================================================
+# GPU ACCELERATION
+# ============================================================================
+
+# OpenCV CUDA separable filters only support kernels up to this size
+CUDA_MAX_KERNEL_SIZE = 32
+
+# Every poster is rendered at this fixed size, so GPU buffers can be reused
+POSTER_WIDTH, POSTER_HEIGHT = 800, 1200
+
+
+def _cuda_available() -> bool:
+    """Check whether OpenCV was built with CUDA and a device is present."""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except (AttributeError, cv2.error):
+        return False
+
+
+# ============================================================================
+# PIXEL KERNELS
+# ============================================================================
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, parallel=True, fastmath=True)
+    def _vignette_kernel(img, strength):
+        """Darken pixels by their distance from the image center."""
+        h, w, channels = img.shape
+        cx, cy = w // 2, h // 2
+        max_dist = math.sqrt(cx * cx + cy * cy)
+        out = np.empty_like(img)
+        for y in prange(h):
+            dy = y - cy
+            for x in range(w):
+                dx = x - cx
+                v = 1.0 - (math.sqrt(dx * dx + dy * dy) / max_dist) ** 1.5 * strength
+                v = min(max(v, 1.0 - strength), 1.0)
+                for c in range(channels):
+                    out[y, x, c] = np.uint8(img[y, x, c] * v)
+        return out
+
+    @njit(cache=True, parallel=True, fastmath=True)
+    def _scanline_kernel(img, period, thickness, amount):
+        """Darken `thickness` rows out of every `period` in place."""
+        h, w, channels = img.shape
+        for y in prange(h):
+            if y % period < thickness:
+                for x in range(w):
+                    for c in range(channels):
+                        img[y, x, c] = max(img[y, x, c] - amount, 0)
+        return img
+
+    def _warmup_pixel_kernels():
+        """Compile the kernels up front so the first job doesn't pay for it."""
+        dummy = np.zeros((32, 32, 3), dtype=np.uint8)
+        _vignette_kernel(dummy, 0.5)
+        _scanline_kernel(dummy, 4, 2, 30)
+
+
+# ============================================================================
+# TEXT RENDERING
+# ============================================================================
+
+WATERMARK_TEXT = "stario.uz"
+WATERMARK_FONT_SIZE = 16
+
+
+@lru_cache(maxsize=8)
+def _load_font(size: int) -> ImageFont.ImageFont:
+    """Load the poster font once per size."""
+    try:
+        return ImageFont.truetype("arial.ttf", size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+@lru_cache(maxsize=256)
+def _render_text_mask(text: str, font_size: int) -> Tuple[np.ndarray, Tuple[int, int]]:
+    """
+    Rasterize text once into an 8-bit coverage mask.
+    Returns the mask and its offset from the text anchor.
+    """
+    font = _load_font(font_size)
+    left, top, right, bottom = ImageDraw.Draw(Image.new("L", (1, 1))).textbbox(
+        (0, 0), text, font=font
+    )
+    mask = Image.new("L", (max(1, right - left), max(1, bottom - top)), 0)
+    ImageDraw.Draw(mask).text((-left, -top), text, font=font, fill=255)
+    return np.asarray(mask), (left, top)
+
+
 # ============================================================================
 # STYLE CONFIGURATIONS
 # ============================================================================
@@ -106,13 +213,18 @@ class FaceSwapService:
         for path in [self.temp_dir, self.templates_path, self.couples_path, self.fonts_path]:
             os.makedirs(path, exist_ok=True)
 
-        # Initialize OpenCV Face Detection (Haar Cascade + DNN)
+        # SCRFD face detector (InsightFace, ONNX Runtime; GPU when available)
+        self.scrfd_detector = self._load_scrfd_detector()
+
+        # Initialize OpenCV Face Detection (Haar Cascade + DNN) as fallback
         self.face_cascade = cv2.CascadeClassifier(
             cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
         )
+        self._cascade_lock = threading.Lock()  # detectMultiScale mutates the shared classifier
 
         # Try to load DNN-based face detector (more accurate)
         self.dnn_face_detector = None
+        self._dnn_lock = threading.Lock()  # cv2.dnn.Net is not safe to share across threads
         try:
             prototxt_path = cv2.data.haarcascades.replace('haarcascades', 'dnn') + 'deploy.prototxt'
             model_path = cv2.data.haarcascades.replace('haarcascades', 'dnn') + 'res10_300x300_ssd_iter_140000.caffemodel'
@@ -122,11 +234,28 @@ class FaceSwapService:
         except Exception as e:
             logger.warning(f"Could not load DNN face detector: {e}")
 
+        # GPU filters for style effects (CPU fallback when CUDA is unavailable)
+        self.use_cuda = _cuda_available()
+        self._cuda_stream = cv2.cuda.Stream() if self.use_cuda else None
+        self._cuda_filters: Dict[Tuple[int, float], object] = {}
+        self._cuda_buffers: Dict[Tuple[int, int], Tuple] = {}
+        if self.use_cuda:
+            logger.info("CUDA enabled for style effects")
+            self._warmup_cuda_styles()
+        if NUMBA_AVAILABLE:
+            _warmup_pixel_kernels()
+
         # Job tracking
         self.jobs: Dict[str, Dict] = {}
+        self._progress_channels: Dict[str, List[asyncio.Queue]] = {}
 
         # Celebrity images cache
         self.celebrity_images: Dict[str, List[str]] = {}
+        self._celeb_photo_cycles: Dict[str, Iterator[str]] = {}
+
+        # Per-celebrity queues of pre-decoded photos, filled in the background
+        self._celeb_prefetch: Dict[str, asyncio.Queue] = {}
+        self._prefetch_tasks: Dict[str, asyncio.Task] = {}
 
         # Couple templates cache
         self.couple_templates: List[str] = []
@@ -134,6 +263,7 @@ class FaceSwapService:
 
         # Load data
         self.celebrities: List[Celebrity] = []
+        self._celeb_by_id: Dict[str, Celebrity] = {}
         self.templates: List[Template] = []
         self._load_celebrities()
         self._create_style_templates()
@@ -143,8 +273,10 @@ class FaceSwapService:
                     f"Couple Templates: {len(self.couple_templates)}")
 
     def _load_couple_templates(self):
-        """Load couple template images for face swap."""
+        """Load, decode and detect faces on couple templates once at startup."""
         self.couple_templates = []
+        self._templates_decoded = []
+        self._template_faces = []
 
         if self.couples_path.exists():
             for img_file in self.couples_path.glob("*.jpg"):
@@ -152,6 +284,16 @@ class FaceSwapService:
             for img_file in self.couples_path.glob("*.png"):
                 self.couple_templates.append(str(img_file))
 
+        for template_path in list(self.couple_templates):
+            template = self._prepare_template(template_path)
+            if template is None:
+                self.couple_templates.remove(template_path)
+                continue
+            self._templates_decoded.append(template)
+
+        # Templates never change, so their face boxes can be cached for good
+        self._template_faces = self._detect_faces_batch(self._templates_decoded)
+
         logger.info(f"Loaded {len(self.couple_templates)} couple templates")
 
     def _load_celebrities(self):
@@ -205,7 +347,11 @@ class FaceSwapService:
                     ))
 
                     self.celebrity_images[celeb_id] = [str(p) for p in photos]
+                    self._celeb_photo_cycles[celeb_id] = itertools.cycle(
+                        random.sample(self.celebrity_images[celeb_id], len(photos))
+                    )
 
+        self._celeb_by_id = {c.id: c for c in self.celebrities}
         logger.info(f"Loaded {len(self.celebrities)} celebrities")
 
     def _create_style_templates(self):
@@ -221,24 +367,127 @@ class FaceSwapService:
                 description=style_config["description"]
             ))
 
+    # ========================================================================
+    # CELEBRITY PHOTO PREFETCH
+    # ========================================================================
+
+    async def _prefetch_celebrity_images(self, celebrity_id: str, queue: asyncio.Queue):
+        """Keep the celebrity's queue topped up with decoded photos."""
+        loop = asyncio.get_running_loop()
+        photo_cycle = self._celeb_photo_cycles[celebrity_id]
+        while True:
+            photo_path = next(photo_cycle)
+            img = await loop.run_in_executor(None, cv2.imread, photo_path)
+            if img is None:
+                logger.error(f"Failed to load celebrity photo: {photo_path}")
+            await queue.put(img)
+
+    async def _next_celebrity_image(self, celebrity_id: str) -> Optional[np.ndarray]:
+        """Get the next pre-decoded photo for a celebrity, starting its prefetcher on first use."""
+        queue = self._celeb_prefetch.get(celebrity_id)
+        if queue is None:
+            queue = asyncio.Queue(maxsize=2)
+            self._celeb_prefetch[celebrity_id] = queue
+            self._prefetch_tasks[celebrity_id] = asyncio.create_task(
+                self._prefetch_celebrity_images(celebrity_id, queue)
+            )
+        return await queue.get()
+
     # ========================================================================
     # FACE DETECTION (OpenCV DNN + Haar Cascade Fallback)
     # ========================================================================
 
-    def _detect_faces_dnn(self, img: np.ndarray) -> List[Tuple[int, int, int, int]]:
-        """Detect faces using OpenCV DNN (SSD) - more accurate."""
-        if self.dnn_face_detector is None:
+    def _onnx_providers(self) -> list:
+        """ONNX Runtime providers, preferring a cached INT8/FP16 TensorRT engine."""
+        providers = []
+        available = ort.get_available_providers()
+        if "TensorrtExecutionProvider" in available:
+            cache_dir = self.base_dir / self.settings.trt_engine_cache_dir
+            calibration_table = self.base_dir / self.settings.trt_int8_calibration_table
+            os.makedirs(cache_dir, exist_ok=True)
+            trt_options = {
+                "trt_fp16_enable": True,
+                "trt_engine_cache_enable": True,
+                "trt_engine_cache_path": str(cache_dir),
+            }
+            # INT8 needs a calibration table built offline from sample face crops
+            if calibration_table.exists():
+                trt_options.update({
+                    "trt_int8_enable": True,
+                    "trt_int8_calibration_table_name": calibration_table.name,
+                })
+                # ONNX Runtime looks the table up relative to the engine cache dir
+                cached_table = cache_dir / calibration_table.name
+                if not cached_table.exists():
+                    cached_table.write_bytes(calibration_table.read_bytes())
+            providers.append(("TensorrtExecutionProvider", trt_options))
+        providers.extend(p for p in available if p != "TensorrtExecutionProvider")
+        return providers
+
+    def _load_scrfd_detector(self):
+        """Load the SCRFD detector from the InsightFace model pack, preferring TensorRT/CUDA."""
+        if not INSIGHTFACE_AVAILABLE:
+            return None
+        try:
+            providers = self._onnx_providers()
+            detector = FaceAnalysis(
+                name=self.settings.face_model_name,
+                root=str(self.base_dir),
+                allowed_modules=["detection"],
+                providers=providers,
+            )
+            # det_size downscales inputs internally, so large photos stay cheap
+            gpu_providers = {"TensorrtExecutionProvider", "CUDAExecutionProvider"}
+            ctx_id = 0 if gpu_providers & set(ort.get_available_providers()) else -1
+            detector.prepare(ctx_id=ctx_id, det_thresh=0.5, det_size=(640, 640))
+            logger.info(f"SCRFD face detector loaded (providers: {providers})")
+            return detector
+        except Exception as e:
+            logger.warning(f"Could not load SCRFD face detector: {e}")
+            return None
+
+    def _detect_faces_scrfd(self, img: np.ndarray) -> List[Tuple[int, int, int, int]]:
+        """Detect faces using SCRFD (ONNX Runtime session is safe to share across threads)."""
+        if self.scrfd_detector is None:
             return []
 
         h, w = img.shape[:2]
-        blob = cv2.dnn.blobFromImage(img, 1.0, (300, 300), (104.0, 177.0, 123.0))
-        self.dnn_face_detector.setInput(blob)
-        detections = self.dnn_face_detector.forward()
-
         faces = []
+        for face in self.scrfd_detector.get(img):
+            x1, y1, x2, y2 = face.bbox.astype(int)
+            x1, y1 = max(0, x1), max(0, y1)
+            x2, y2 = min(w, x2), min(h, y2)
+            fw, fh = x2 - x1, y2 - y1
+            if fw > 20 and fh > 20:
+                faces.append((int(x1), int(y1), int(fw), int(fh)))
+
+        # Sort by x coordinate (left to right)
+        faces.sort(key=lambda f: f[0])
+        return faces
+
+    def _detect_faces_dnn(self, img: np.ndarray) -> List[Tuple[int, int, int, int]]:
+        """Detect faces using OpenCV DNN (SSD) - more accurate."""
+        return self._detect_faces_dnn_batch([img])[0]
+
+    def _detect_faces_dnn_batch(self, imgs: List[np.ndarray]) -> List[List[Tuple[int, int, int, int]]]:
+        """Detect faces in several images with a single SSD forward pass."""
+        if self.dnn_face_detector is None or not imgs:
+            return [[] for _ in imgs]
+
+        blob = cv2.dnn.blobFromImages(imgs, 1.0, (300, 300), (104.0, 177.0, 123.0))
+        with self._dnn_lock:
+            self.dnn_face_detector.setInput(blob)
+            detections = self.dnn_face_detector.forward()
+
+        results: List[List[Tuple[int, int, int, int]]] = [[] for _ in imgs]
         for i in range(detections.shape[2]):
             confidence = detections[0, 0, i, 2]
             if confidence > 0.5:  # Confidence threshold
+                image_idx = int(detections[0, 0, i, 0])
+                if not 0 <= image_idx < len(imgs):
+                    continue
+                h, w = imgs[image_idx].shape[:2]
+
                 x1 = int(detections[0, 0, i, 3] * w)
                 y1 = int(detections[0, 0, i, 4] * h)
                 x2 = int(detections[0, 0, i, 5] * w)
@@ -254,35 +503,45 @@ class FaceSwapService:
                 fh = y2 - y1
 
                 if fw > 20 and fh > 20:
-                    faces.append((x1, y1, fw, fh))
+                    results[image_idx].append((x1, y1, fw, fh))
 
         # Sort by x coordinate (left to right)
-        faces.sort(key=lambda f: f[0])
-        return faces
+        for faces in results:
+            faces.sort(key=lambda f: f[0])
+        return results
 
     def _detect_faces_cascade(self, img: np.ndarray) -> List[Tuple[int, int, int, int]]:
         """Fallback face detection using Haar Cascade."""
         gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
         # More permissive parameters for better detection on varied images
-        faces = self.face_cascade.detectMultiScale(
-            gray,
-            scaleFactor=1.05,  # More granular scale
-            minNeighbors=3,    # Lower threshold for detection
-            minSize=(20, 20),  # Smaller minimum face size
-            flags=cv2.CASCADE_SCALE_IMAGE
-        )
+        with self._cascade_lock:
+            faces = self.face_cascade.detectMultiScale(
+                gray,
+                scaleFactor=1.05,  # More granular scale
+                minNeighbors=3,    # Lower threshold for detection
+                minSize=(20, 20),  # Smaller minimum face size
+                flags=cv2.CASCADE_SCALE_IMAGE
+            )
         result = [(int(x), int(y), int(w), int(h)) for (x, y, w, h) in faces]
         result.sort(key=lambda f: f[0])  # Sort left to right
         return result
 
     def _detect_faces(self, img: np.ndarray) -> List[Tuple[int, int, int, int]]:
-        """Detect faces using DNN first, fallback to Haar Cascade."""
-        # Try DNN detector first (more accurate)
-        faces = self._detect_faces_dnn(img)
-        if not faces:
-            # Fallback to Haar Cascade
-            faces = self._detect_faces_cascade(img)
-        return faces
+        """Detect faces using SCRFD or DNN first, fallback to Haar Cascade."""
+        return self._detect_faces_batch([img])[0]
+
+    def _detect_faces_batch(self, imgs: List[np.ndarray]) -> List[List[Tuple[int, int, int, int]]]:
+        """Detect faces in several images with SCRFD or a batched DNN pass; Haar Cascade per-image fallback."""
+        if self.scrfd_detector is not None:
+            results = [self._detect_faces_scrfd(img) for img in imgs]
+        else:
+            # Try DNN detector first (more accurate)
+            results = self._detect_faces_dnn_batch(imgs)
+        for i, faces in enumerate(results):
+            if not faces:
+                # Fallback to Haar Cascade
+                results[i] = self._detect_faces_cascade(imgs[i])
+        return results
 
     # ========================================================================
     # FACE EXTRACTION & BLENDING
@@ -322,13 +581,15 @@ class FaceSwapService:
         return mask
 
     def _swap_face(self, target_img: np.ndarray, source_img: np.ndarray,
-                   target_face: Tuple[int, int, int, int]) -> np.ndarray:
+                   target_face: Tuple[int, int, int, int],
+                   source_faces: Optional[List[Tuple[int, int, int, int]]] = None) -> np.ndarray:
         """
         Swap a face from source_img onto target_img at target_face position.
         Uses seamlessClone for natural blending.
         """
-        # Detect face in source image
-        source_faces = self._detect_faces(source_img)
+        # Detect face in source image (unless already detected by the caller)
+        if source_faces is None:
+            source_faces = self._detect_faces(source_img)
         if not source_faces:
             logger.warning("No face detected in source image")
             return target_img
@@ -407,20 +668,26 @@ class FaceSwapService:
 
     def _swap_faces_on_template(self, template_img: np.ndarray,
                                  user_img: np.ndarray,
-                                 celeb_img: np.ndarray) -> np.ndarray:
+                                 celeb_img: np.ndarray,
+                                 template_faces: Optional[List[Tuple[int, int, int, int]]] = None) -> np.ndarray:
         """
         REAL face swap: Detect 2 faces in template and replace them.
         Face #1 (left) -> User's face
         Face #2 (right) -> Celebrity's face
         """
-        # Detect faces in template
-        template_faces = self._detect_faces(template_img)
+        # Detect faces in user and celebrity photos (and template, unless cached) in one batch
+        if template_faces is None:
+            template_faces, user_faces, celeb_faces = self._detect_faces_batch(
+                [template_img, user_img, celeb_img]
+            )
+        else:
+            user_faces, celeb_faces = self._detect_faces_batch([user_img, celeb_img])
 
         if len(template_faces) < 2:
             logger.warning(f"Only found {len(template_faces)} faces in template, need 2")
             # If only 1 face found, still try to swap it
             if len(template_faces) == 1:
-                result = self._swap_face(template_img, user_img, template_faces[0])
+                result = self._swap_face(template_img, user_img, template_faces[0], user_faces)
                 return result
             return template_img
 
@@ -430,21 +697,26 @@ class FaceSwapService:
 
         # Swap face #1 (left) with user
         logger.info(f"Swapping left face at {template_faces[0]} with user face")
-        result = self._swap_face(result, user_img, template_faces[0])
+        result = self._swap_face(result, user_img, template_faces[0], user_faces)
 
         # Swap face #2 (right) with celebrity
         logger.info(f"Swapping right face at {template_faces[1]} with celebrity face")
-        result = self._swap_face(result, celeb_img, template_faces[1])
+        result = self._swap_face(result, celeb_img, template_faces[1], celeb_faces)
 
         return result
 
-    def _get_random_template(self) -> Optional[np.ndarray]:
-        """Get a random couple template image."""
-        if not self.couple_templates:
+    def _get_random_template(self) -> Tuple[Optional[np.ndarray], List[Tuple[int, int, int, int]]]:
+        """Get a random pre-decoded couple template and its cached face boxes."""
+        if not self._templates_decoded:
             logger.warning("No couple templates available")
-            return None
+            return None, []
+
+        index = random.randrange(len(self._templates_decoded))
+        # Copy so swaps and styles never touch the cached template
+        return self._templates_decoded[index].copy(), self._template_faces[index]
 
-        template_path = random.choice(self.couple_templates)
+    def _prepare_template(self, template_path: str) -> Optional[np.ndarray]:
+        """Decode a couple template and fit it to poster dimensions."""
         template = cv2.imread(template_path)
 
         if template is None:
@@ -453,7 +725,7 @@ class FaceSwapService:
 
         # Resize template to poster dimensions (800x1200)
         h, w = template.shape[:2]
-        target_w, target_h = 800, 1200
+        target_w, target_h = POSTER_WIDTH, POSTER_HEIGHT
 
         # Calculate resize to fill while maintaining aspect
         scale = max(target_w / w, target_h / h)
@@ -465,7 +737,9 @@ class FaceSwapService:
         # Center crop to target size
         start_x = (new_w - target_w) // 2
         start_y = (new_h - target_h) // 2
-        template = template[start_y:start_y + target_h, start_x:start_x + target_w]
+        template = np.ascontiguousarray(
+            template[start_y:start_y + target_h, start_x:start_x + target_w]
+        )
 
         return template
 
@@ -499,6 +773,66 @@ class FaceSwapService:
         else:
             return img
 
+    def _get_cuda_gaussian(self, ksize: int, sigma: float):
+        """Get a cached CUDA Gaussian filter for BGRA images."""
+        key = (ksize, sigma)
+        gpu_filter = self._cuda_filters.get(key)
+        if gpu_filter is None:
+            gpu_filter = cv2.cuda.createGaussianFilter(
+                cv2.CV_8UC4, cv2.CV_8UC4, (ksize, ksize), sigma
+            )
+            self._cuda_filters[key] = gpu_filter
+        return gpu_filter
+
+    def _get_cuda_buffers(self, shape: Tuple[int, int]) -> Tuple:
+        """Get device buffers for a frame size, allocated once and reused by every job."""
+        buffers = self._cuda_buffers.get(shape)
+        if buffers is None:
+            h, w = shape
+            buffers = (
+                cv2.cuda_GpuMat(h, w, cv2.CV_8UC3),
+                cv2.cuda_GpuMat(h, w, cv2.CV_8UC4),
+                cv2.cuda_GpuMat(h, w, cv2.CV_8UC4),
+                cv2.cuda_GpuMat(h, w, cv2.CV_8UC4),
+            )
+            self._cuda_buffers[shape] = buffers
+        return buffers
+
+    def _warmup_cuda_styles(self):
+        """Allocate poster-sized buffers and build every style's filters before the first job."""
+        dummy = np.zeros((POSTER_HEIGHT, POSTER_WIDTH, 3), dtype=np.uint8)
+        for style_id in STYLES:
+            self._apply_style(dummy, style_id)
+
+    def _gaussian_blur(self, img: np.ndarray, ksize: int, sigma: float,
+                       blend_weight: Optional[float] = None) -> np.ndarray:
+        """
+        Gaussian blur, optionally blended back over the original image
+        (original * (1 - blend_weight) + blur * blend_weight).
+        Runs on the GPU when available, with a single upload/download.
+        """
+        if not self.use_cuda or ksize > CUDA_MAX_KERNEL_SIZE:
+            blur = cv2.GaussianBlur(img, (ksize, ksize), sigma)
+            if blend_weight is None:
+                return blur
+            return cv2.addWeighted(img, 1 - blend_weight, blur, blend_weight, 0)
+
+        stream = self._cuda_stream
+        gpu_bgr, gpu_src, gpu_blur, gpu_blend = self._get_cuda_buffers(img.shape[:2])
+        gpu_bgr.upload(img, stream=stream)
+        # CUDA linear filters need 1 or 4 channels
+        cv2.cuda.cvtColor(gpu_bgr, cv2.COLOR_BGR2BGRA, dst=gpu_src, stream=stream)
+        self._get_cuda_gaussian(ksize, sigma).apply(gpu_src, dst=gpu_blur, stream=stream)
+        gpu_dst = gpu_blur
+        if blend_weight is not None:
+            cv2.cuda.addWeighted(gpu_src, 1 - blend_weight, gpu_blur, blend_weight, 0,
+                                 dst=gpu_blend, stream=stream)
+            gpu_dst = gpu_blend
+        cv2.cuda.cvtColor(gpu_dst, cv2.COLOR_BGRA2BGR, dst=gpu_bgr, stream=stream)
+        result = gpu_bgr.download(stream=stream)
+        stream.waitForCompletion()
+        return result
+
     def _apply_noir_effect(self, img: np.ndarray) -> np.ndarray:
         """Black and white with grain and high contrast."""
         # Convert to grayscale
@@ -525,8 +859,7 @@ class FaceSwapService:
         result = cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
 
         # Add glow
-        glow = cv2.GaussianBlur(result, (51, 51), 30)
-        result = cv2.addWeighted(result, 0.7, glow, 0.3, 0)
+        result = self._gaussian_blur(result, 51, 30, blend_weight=0.3)
 
         # Color tint (cyan/magenta)
         result[:, :, 0] = np.clip(result[:, :, 0].astype(np.int16) + 30, 0, 255).astype(np.uint8)
@@ -543,9 +876,12 @@ class FaceSwapService:
         result[:, :, 2] = np.clip(result[:, :, 2].astype(np.int16) + 20, 0, 255).astype(np.uint8)
 
         # Scanlines
-        h, w = result.shape[:2]
-        for y in range(0, h, 4):
-            result[y:y+2, :] = np.clip(result[y:y+2, :].astype(np.int16) - 30, 0, 255).astype(np.uint8)
+        if NUMBA_AVAILABLE:
+            result = _scanline_kernel(result, 4, 2, 30)
+        else:
+            h, w = result.shape[:2]
+            for y in range(0, h, 4):
+                result[y:y+2, :] = np.clip(result[y:y+2, :].astype(np.int16) - 30, 0, 255).astype(np.uint8)
 
         # Chromatic aberration
         b, g, r = cv2.split(result)
@@ -554,7 +890,7 @@ class FaceSwapService:
         result = cv2.merge([b, g, r])
 
         # Slight blur (VHS look)
-        result = cv2.GaussianBlur(result, (3, 3), 1)
+        result = self._gaussian_blur(result, 3, 1)
 
         return result
 
@@ -567,8 +903,7 @@ class FaceSwapService:
         result[:, :, 2] = np.clip(result[:, :, 2].astype(np.int16) + 30, 0, 255).astype(np.uint8)
 
         # Soft glow
-        glow = cv2.GaussianBlur(result, (31, 31), 15)
-        result = cv2.addWeighted(result, 0.6, glow, 0.4, 0)
+        result = self._gaussian_blur(result, 31, 15, blend_weight=0.4)
 
         # Light vignette
         result = self._add_vignette(result, strength=0.3)
@@ -651,7 +986,7 @@ class FaceSwapService:
         edges = cv2.Canny(result, 50, 150)
         edges = cv2.dilate(edges, None)
         edges_3ch = cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR)
-        result = cv2.subtract(result, edges_3ch * 0.3)
+        result = cv2.subtract(result, (edges_3ch * 0.3).astype(np.uint8))
 
         # High contrast
         result = cv2.convertScaleAbs(result, alpha=1.2, beta=10)
@@ -671,13 +1006,15 @@ class FaceSwapService:
         result[:, :, 0] = np.clip(result[:, :, 0].astype(np.int16) + 15, 0, 255).astype(np.uint8)
 
         # Soft focus
-        blur = cv2.GaussianBlur(result, (5, 5), 2)
-        result = cv2.addWeighted(result, 0.8, blur, 0.2, 0)
+        result = self._gaussian_blur(result, 5, 2, blend_weight=0.2)
 
         return result
 
     def _add_vignette(self, img: np.ndarray, strength: float = 0.5) -> np.ndarray:
         """Add vignette effect."""
+        if NUMBA_AVAILABLE:
+            return _vignette_kernel(np.ascontiguousarray(img), strength)
+
         h, w = img.shape[:2]
         Y, X = np.ogrid[:h, :w]
         center = (w // 2, h // 2)
@@ -699,19 +1036,25 @@ class FaceSwapService:
     def _add_poster_text(self, img: np.ndarray, celebrity_name: str,
                          style_id: str, custom_title: str = None) -> np.ndarray:
         """Add only watermark - no other text."""
-        img_pil = Image.fromarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
-        draw = ImageDraw.Draw(img_pil)
-        W, H = img_pil.size
-
-        try:
-            small_font = ImageFont.truetype("arial.ttf", 16)
-        except:
-            small_font = ImageFont.load_default()
+        result = img.copy()
+        H, W = result.shape[:2]
+
+        mask, (off_x, off_y) = _render_text_mask(WATERMARK_TEXT, WATERMARK_FONT_SIZE)
+        x1 = W - 80 + off_x
+        y1 = H - 20 + off_y
+        x2 = min(W, x1 + mask.shape[1])
+        y2 = min(H, y1 + mask.shape[0])
+        if x2 <= max(0, x1) or y2 <= max(0, y1):
+            return result
 
-        # Only watermark
-        draw.text((W - 80, H - 20), "stario.uz", font=small_font, fill=(255, 255, 255, 128))
+        # Blend white text over the covered region only
+        alpha = mask[max(0, -y1):y2 - y1, max(0, -x1):x2 - x1, np.newaxis] / 255.0
+        region = result[max(0, y1):y2, max(0, x1):x2]
+        result[max(0, y1):y2, max(0, x1):x2] = (
+            region * (1 - alpha) + 255 * alpha
+        ).astype(np.uint8)
 
-        return cv2.cvtColor(np.array(img_pil), cv2.COLOR_RGB2BGR)
+        return result
 
     # ========================================================================
     # API METHODS
@@ -787,7 +1130,7 @@ class FaceSwapService:
         """Start poster generation."""
         job_id = str(uuid.uuid4())[:8]
 
-        celebrity = next((c for c in self.celebrities if c.id == celebrity_id), None)
+        celebrity = self._celeb_by_id.get(celebrity_id)
         if not celebrity:
             return GenerateResponse(job_id=job_id, status=JobStatus.FAILED,
                                    error="Знаменитость не найдена")
@@ -830,9 +1173,7 @@ class FaceSwapService:
             style_config = STYLES[style_id]
 
             # Stage 1: Load images
-            job["stage"] = "Загрузка фото..."
-            job["progress"] = 10
-            await asyncio.sleep(0.2)
+            self._set_progress(job_id, 10, "Загрузка фото...")
 
             user_img = cv2.imread(str(self.temp_dir / f"{face_id}_original.jpg"))
             if user_img is None:
@@ -840,60 +1181,86 @@ class FaceSwapService:
 
             celeb_img = None
             if celebrity_id in self.celebrity_images:
-                celeb_path = random.choice(self.celebrity_images[celebrity_id])
-                celeb_img = cv2.imread(celeb_path)
+                celeb_img = await self._next_celebrity_image(celebrity_id)
             if celeb_img is None:
                 raise Exception("Фото знаменитости не найдено")
 
-            celebrity = next(c for c in self.celebrities if c.id == celebrity_id)
+            celebrity = self._celeb_by_id[celebrity_id]
 
             # Stage 2: Load couple template
-            job["stage"] = "Загрузка шаблона..."
-            job["progress"] = 25
-            await asyncio.sleep(0.2)
+            self._set_progress(job_id, 25, "Загрузка шаблона...")
 
-            template = self._get_random_template()
+            template, template_faces = self._get_random_template()
             if template is None:
                 raise Exception("Шаблон с парой не найден. Добавьте фото в templates/couples/")
 
             # Stage 3: REAL Face Swap
-            job["stage"] = "AI замена лиц..."
-            job["progress"] = 40
-            await asyncio.sleep(0.5)
+            self._set_progress(job_id, 40, "AI замена лиц...")
 
-            result = self._swap_faces_on_template(template, user_img, celeb_img)
+            # Run off the event loop; OpenCV releases the GIL, and a thread
+            # shares the decoded arrays by reference (no pickling/copies)
+            result = await asyncio.get_running_loop().run_in_executor(
+                None, self._swap_faces_on_template, template, user_img, celeb_img, template_faces
+            )
 
             # Stage 4: Apply style effects
-            job["stage"] = f"Применение стиля {style_config['name']}..."
-            job["progress"] = 70
-            await asyncio.sleep(0.3)
+            self._set_progress(job_id, 70, f"Применение стиля {style_config['name']}...")
 
             result = self._apply_style(result, style_id)
 
             # Stage 5: Add text
-            job["stage"] = "Добавление текста..."
-            job["progress"] = 85
-            await asyncio.sleep(0.2)
+            self._set_progress(job_id, 85, "Добавление текста...")
 
             result = self._add_poster_text(result, celebrity.name, style_id)
 
             # Stage 6: Save
-            job["stage"] = "Сохранение..."
-            job["progress"] = 95
-            await asyncio.sleep(0.1)
+            self._set_progress(job_id, 95, "Сохранение...")
 
             result_path = self.temp_dir / f"{job_id}_result.jpg"
             cv2.imwrite(str(result_path), result, [cv2.IMWRITE_JPEG_QUALITY, 95])
 
             job["status"] = JobStatus.COMPLETED
-            job["progress"] = 100
-            job["stage"] = "Готово!"
             job["result_url"] = f"/temp/{job_id}_result.jpg"
+            self._set_progress(job_id, 100, "Готово!")
 
         except Exception as e:
             logger.error(f"Generation error: {e}")
             job["status"] = JobStatus.FAILED
             job["error"] = str(e)
+            self._publish_progress(job_id)
+
+    def _set_progress(self, job_id: str, progress: int, stage: str):
+        """Record a stage boundary and push it to progress subscribers."""
+        job = self.jobs[job_id]
+        job["progress"] = progress
+        job["stage"] = stage
+        self._publish_progress(job_id)
+
+    def _publish_progress(self, job_id: str):
+        """Send the current job status to everyone subscribed to it."""
+        status = self.get_job_status(job_id)
+        for queue in self._progress_channels.get(job_id, []):
+            queue.put_nowait(status)
+
+    async def subscribe(self, job_id: str) -> AsyncIterator[GenerateResponse]:
+        """Yield job status on every stage change until the job finishes."""
+        status = self.get_job_status(job_id)
+        if status is None:
+            return
+
+        queue: asyncio.Queue = asyncio.Queue()
+        channels = self._progress_channels.setdefault(job_id, [])
+        channels.append(queue)
+        try:
+            while True:
+                yield status
+                if status.status in (JobStatus.COMPLETED, JobStatus.FAILED):
+                    return
+                status = await queue.get()
+        finally:
+            channels.remove(queue)
+            if not channels:
+                self._progress_channels.pop(job_id, None)
 
     def get_job_status(self, job_id: str) -> Optional[GenerateResponse]:
         """Get job status."""
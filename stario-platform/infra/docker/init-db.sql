@@ -31,7 +31,7 @@ CREATE TABLE IF NOT EXISTS stario.users (
     deleted_at TIMESTAMP WITH TIME ZONE
 );
 
-CREATE INDEX idx_users_email ON stario.users(email);
+-- email lookups use the index behind its UNIQUE constraint, id the primary key
 CREATE INDEX idx_users_telegram_id ON stario.users(telegram_id);
 CREATE INDEX idx_users_role ON stario.users(role);
 
@@ -60,9 +60,16 @@ CREATE TABLE IF NOT EXISTS stario.artists (
     deleted_at TIMESTAMP WITH TIME ZONE
 );
 
-CREATE INDEX idx_artists_category ON stario.artists(category);
+-- Artist queries only ever look at rows that are not soft-deleted
+CREATE INDEX idx_artists_category ON stario.artists(category) WHERE deleted_at IS NULL;
 CREATE INDEX idx_artists_country ON stario.artists(country);
-CREATE INDEX idx_artists_status ON stario.artists(verification_status);
+CREATE INDEX idx_artists_status ON stario.artists(verification_status) WHERE deleted_at IS NULL;
+-- Keyset pagination of the artist list
+CREATE INDEX idx_artists_created_at_id ON stario.artists(created_at DESC, id DESC) WHERE deleted_at IS NULL;
+-- Substring search (ILIKE '%...%') over name, stage name and bio
+CREATE INDEX idx_artists_search_trgm ON stario.artists
+    USING gin (name gin_trgm_ops, stage_name gin_trgm_ops, bio gin_trgm_ops)
+    WHERE deleted_at IS NULL;
 
 -- Artist verification documents
 CREATE TABLE IF NOT EXISTS stario.artist_verifications (
@@ -207,7 +214,9 @@ CREATE TABLE IF NOT EXISTS stario.orders (
     completed_at TIMESTAMP WITH TIME ZONE
 );
 
-CREATE INDEX idx_orders_user ON stario.orders(user_id);
+-- Order lists are newest first and paged by (created_at, id) cursors
+CREATE INDEX idx_orders_user_created ON stario.orders(user_id, created_at DESC, id DESC);
+CREATE INDEX idx_orders_created ON stario.orders(created_at DESC, id DESC);
 CREATE INDEX idx_orders_status ON stario.orders(status);
 
 -- Order items
@@ -223,6 +232,9 @@ CREATE TABLE IF NOT EXISTS stario.order_items (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+CREATE INDEX idx_order_items_order ON stario.order_items(order_id);
+CREATE INDEX idx_order_items_artist ON stario.order_items(artist_id);
+
 -- Payments
 CREATE TABLE IF NOT EXISTS stario.payments (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -319,12 +331,21 @@ CREATE TABLE IF NOT EXISTS stario.audit_logs (
     resource_id VARCHAR(100) NOT NULL,
     details JSONB,
     ip_address INET,
-    user_agent TEXT
+    user_agent TEXT,
+    -- Full-text search over the action and details (GET /content/audit-logs?q=)
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(action, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(details::text, '')), 'B')
+    ) STORED
 );
 
-CREATE INDEX idx_audit_timestamp ON stario.audit_logs(timestamp);
+-- The filters return newest first and page by (timestamp, id) cursors, so
+-- each index is ordered to match
+CREATE INDEX idx_audit_timestamp ON stario.audit_logs(timestamp DESC, id DESC);
 CREATE INDEX idx_audit_action ON stario.audit_logs(action);
-CREATE INDEX idx_audit_actor ON stario.audit_logs(actor_id);
+CREATE INDEX idx_audit_actor_timestamp ON stario.audit_logs(actor_id, timestamp DESC, id DESC);
+CREATE INDEX idx_audit_resource_type_timestamp ON stario.audit_logs(resource_type, timestamp DESC, id DESC);
+CREATE INDEX idx_audit_search ON stario.audit_logs USING GIN(search_vector);
 
 -- Partition audit logs by month for easier cleanup
 -- (Implementation depends on PostgreSQL version)
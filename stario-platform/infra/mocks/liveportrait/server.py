@@ -7,6 +7,36 @@ import time
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
 
+try:
+    import orjson
+
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    def dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+
+# Responses never change, so they are serialized once at import time
+HEALTH_RESPONSE = dumps({
+    'status': 'healthy',
+    'service': 'mock-liveportrait',
+    'version': '1.0.0',
+    'mode': 'mock'
+})
+
+GENERATE_RESPONSE = dumps({
+    'status': 'success',
+    'video_url': 'https://storage.stario.uz/mock/generated_video.mp4',
+    'processing_time_ms': 500,
+    'mode': 'mock'
+})
+
+STATUS_RESPONSE = dumps({
+    'status': 'completed',
+    'progress': 100
+})
+
 class MockLivePortraitHandler(BaseHTTPRequestHandler):
     def do_GET(self):
         parsed = urlparse(self.path)
@@ -15,13 +45,7 @@ class MockLivePortraitHandler(BaseHTTPRequestHandler):
             self.send_response(200)
             self.send_header('Content-Type', 'application/json')
             self.end_headers()
-            response = {
-                'status': 'healthy',
-                'service': 'mock-liveportrait',
-                'version': '1.0.0',
-                'mode': 'mock'
-            }
-            self.wfile.write(json.dumps(response).encode())
+            self.wfile.write(HEALTH_RESPONSE)
         else:
             self.send_response(404)
             self.end_headers()
@@ -36,24 +60,12 @@ class MockLivePortraitHandler(BaseHTTPRequestHandler):
             self.send_response(200)
             self.send_header('Content-Type', 'application/json')
             self.end_headers()
-
-            response = {
-                'status': 'success',
-                'video_url': 'https://storage.stario.uz/mock/generated_video.mp4',
-                'processing_time_ms': 500,
-                'mode': 'mock'
-            }
-            self.wfile.write(json.dumps(response).encode())
+            self.wfile.write(GENERATE_RESPONSE)
         elif parsed.path == '/status':
             self.send_response(200)
             self.send_header('Content-Type', 'application/json')
             self.end_headers()
-
-            response = {
-                'status': 'completed',
-                'progress': 100
-            }
-            self.wfile.write(json.dumps(response).encode())
+            self.wfile.write(STATUS_RESPONSE)
         else:
             self.send_response(404)
             self.end_headers()
@@ -4,7 +4,7 @@ Load testing script for Stario Platform using Locust.
 
 Usage:
     # Install dependencies
-    pip install locust
+    pip install locust orjson
 
     # Run load test (web UI)
     locust -f load-test.py --host=http://localhost:8000
@@ -14,43 +14,87 @@ Usage:
 
     # Run with specific scenario
     locust -f load-test.py --host=http://localhost:8000 --tags video
+
+    # Reuse pre-issued tokens instead of registering every simulated user
+    locust -f load-test.py --host=http://localhost:8000 --token-file=tokens.json
 """
 
-import json
+import itertools
 import random
 import string
-from locust import HttpUser, task, between, tag, events
-from locust.runners import MasterRunner
+
+import orjson
+from locust import task, between, tag, events
+from locust.contrib.fasthttp import FastHttpUser
+from locust.runners import LocalRunner, MasterRunner, WorkerRunner
+
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def post_json(client, path, payload, headers=None, **kwargs):
+    """POST a payload serialized with orjson instead of the client's stdlib json."""
+    if headers:
+        headers = {**JSON_HEADERS, **headers}
+    else:
+        headers = JSON_HEADERS
+    return client.post(path, data=orjson.dumps(payload), headers=headers, **kwargs)
+
+
+# Test data pools (pre-generated once per worker so tasks only index into them)
+POOL_SIZE = 10_000
+
+EMAIL_POOL = [
+    f"{''.join(random.choices(string.ascii_lowercase, k=8))}@test.stario.uz"
+    for _ in range(POOL_SIZE)
+]
+
+PHONE_POOL = [f"+99890{random.randint(1000000, 9999999)}" for _ in range(POOL_SIZE)]
+
+GREETINGS = [
+    "Happy birthday! Wishing you all the best!",
+    "Congratulations on your special day!",
+    "Best wishes for your celebration!",
+    "May all your dreams come true!",
+    "Sending you lots of love and happiness!"
+]
+
+RECIPIENT_NAMES = ["John", "Alice", "Amir", "Dilnoza", "Bekzod", "Malika", "Rustam", "Gulnora"]
 
 
 # Test data generators
 def random_email():
-    """Generate random email address."""
-    chars = ''.join(random.choices(string.ascii_lowercase, k=8))
-    return f"{chars}@test.stario.uz"
+    """Pick a random email address from the pre-generated pool."""
+    return EMAIL_POOL[random.randrange(POOL_SIZE)]
 
 
 def random_phone():
-    """Generate random Uzbek phone number."""
-    return f"+99890{random.randint(1000000, 9999999)}"
+    """Pick a random Uzbek phone number from the pre-generated pool."""
+    return PHONE_POOL[random.randrange(POOL_SIZE)]
 
 
 def random_message():
-    """Generate random greeting message."""
-    greetings = [
-        "Happy birthday! Wishing you all the best!",
-        "Congratulations on your special day!",
-        "Best wishes for your celebration!",
-        "May all your dreams come true!",
-        "Sending you lots of love and happiness!"
-    ]
-    return random.choice(greetings)
+    """Pick a random greeting message."""
+    return random.choice(GREETINGS)
 
 
 def random_recipient():
-    """Generate random recipient name."""
-    names = ["John", "Alice", "Amir", "Dilnoza", "Bekzod", "Malika", "Rustam", "Gulnora"]
-    return random.choice(names)
+    """Pick a random recipient name."""
+    return random.choice(RECIPIENT_NAMES)
+
+
+# Request parameter choices (module-level so tasks don't rebuild them per call)
+CATEGORIES = ("singer", "actor", "blogger", "athlete")
+OCCASIONS = ("birthday", "greeting", "holiday")
+DURATIONS = (15, 30, 60)
+POSTER_STYLES = ("modern", "vintage", "neon")
+ASPECT_RATIOS = ("1:1", "4:5", "16:9")
+
+
+# Pre-issued {"access_token", "refresh_token"} pairs shared by simulated users.
+# Filled from --token-file on the master and sliced out to each worker.
+TOKEN_POOL = []
+_token_counter = itertools.count()
 
 
 # Test artist IDs (would be populated from DB in real scenario)
@@ -61,21 +105,29 @@ TEST_ARTIST_IDS = [
 ]
 
 
-class StarioUser(HttpUser):
+class StarioUser(FastHttpUser):
     """Simulated Stario platform user."""
 
     wait_time = between(1, 5)  # Wait 1-5 seconds between tasks
+    network_timeout = 30.0
+    connection_timeout = 10.0
     access_token = None
     refresh_token = None
 
     def on_start(self):
         """Called when a simulated user starts."""
+        if TOKEN_POOL:
+            tokens = TOKEN_POOL[next(_token_counter) % len(TOKEN_POOL)]
+            self.access_token = tokens.get("access_token")
+            self.refresh_token = tokens.get("refresh_token")
+            return
+
         # Register and login
         email = random_email()
         password = "TestPassword123!"
 
         # Register
-        response = self.client.post("/auth/register", json={
+        response = post_json(self.client, "/auth/register", {
             "email": email,
             "password": password,
             "full_name": "Load Test User",
@@ -83,17 +135,17 @@ class StarioUser(HttpUser):
         })
 
         if response.status_code == 201:
-            data = response.json()
+            data = orjson.loads(response.content)
             self.access_token = data.get("access_token")
             self.refresh_token = data.get("refresh_token")
         elif response.status_code == 409:
             # User exists, try login
-            response = self.client.post("/auth/login", json={
+            response = post_json(self.client, "/auth/login", {
                 "email": email,
                 "password": password
             })
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 self.access_token = data.get("access_token")
                 self.refresh_token = data.get("refresh_token")
 
@@ -126,9 +178,8 @@ class StarioUser(HttpUser):
     @task(5)
     def filter_artists(self):
         """List artists with filters."""
-        categories = ["singer", "actor", "blogger", "athlete"]
         self.client.get("/artists", params={
-            "category": random.choice(categories),
+            "category": random.choice(CATEGORIES),
             "country": "UZ",
             "page": 1,
             "page_size": 20
@@ -141,20 +192,20 @@ class StarioUser(HttpUser):
         if not self.access_token:
             return
 
-        response = self.client.post("/videos/generate",
-            json={
+        response = post_json(self.client, "/videos/generate",
+            {
                 "artist_id": random.choice(TEST_ARTIST_IDS),
                 "custom_message": random_message(),
                 "recipient_name": random_recipient(),
-                "occasion": random.choice(["birthday", "greeting", "holiday"]),
+                "occasion": random.choice(OCCASIONS),
                 "language": "uz",
-                "duration_seconds": random.choice([15, 30, 60])
+                "duration_seconds": random.choice(DURATIONS)
             },
             headers=self.get_auth_headers()
         )
 
         if response.status_code == 200:
-            job_id = response.json().get("job_id")
+            job_id = orjson.loads(response.content).get("job_id")
             if job_id:
                 # Poll for status
                 self.client.get(f"/videos/jobs/{job_id}", headers=self.get_auth_headers())
@@ -175,8 +226,8 @@ class StarioUser(HttpUser):
         if not self.access_token:
             return
 
-        self.client.post("/face-quiz/start",
-            json={
+        post_json(self.client, "/face-quiz/start",
+            {
                 "artist_id": random.choice(TEST_ARTIST_IDS),
                 "save_photo": False
             },
@@ -197,12 +248,12 @@ class StarioUser(HttpUser):
         if not self.access_token:
             return
 
-        self.client.post("/posters/generate",
-            json={
+        post_json(self.client, "/posters/generate",
+            {
                 "artist_id": random.choice(TEST_ARTIST_IDS),
                 "text": random_message()[:50],
-                "style": random.choice(["modern", "vintage", "neon"]),
-                "aspect_ratio": random.choice(["1:1", "4:5", "16:9"])
+                "style": random.choice(POSTER_STYLES),
+                "aspect_ratio": random.choice(ASPECT_RATIOS)
             },
             headers=self.get_auth_headers()
         )
@@ -238,30 +289,32 @@ class StarioUser(HttpUser):
         if not self.refresh_token:
             return
 
-        response = self.client.post("/auth/refresh", json={
+        response = post_json(self.client, "/auth/refresh", {
             "refresh_token": self.refresh_token
         })
 
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             self.access_token = data.get("access_token")
 
 
-class AdminUser(HttpUser):
+class AdminUser(FastHttpUser):
     """Simulated admin user for load testing admin endpoints."""
 
     wait_time = between(2, 10)
+    network_timeout = 30.0
+    connection_timeout = 10.0
     weight = 1  # Less frequent than regular users
 
     def on_start(self):
         """Login as admin."""
-        response = self.client.post("/auth/login", json={
+        response = post_json(self.client, "/auth/login", {
             "email": "admin@stario.uz",
             "password": "AdminPassword123!"
         })
 
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             self.access_token = data.get("access_token")
         else:
             self.access_token = None
@@ -309,6 +362,32 @@ class AdminUser(HttpUser):
         self.client.get("/orders", headers=self.get_auth_headers())
 
 
+# Token pool distribution
+@events.init_command_line_parser.add_listener
+def on_init_parser(parser):
+    """Register custom command line options."""
+    parser.add_argument("--token-file", type=str, env_var="LOCUST_TOKEN_FILE", default="",
+                        help="JSON list of {access_token, refresh_token} pairs to share between users")
+
+
+def on_tokens_message(environment, msg, **kwargs):
+    """Receive this worker's slice of the token pool from the master."""
+    TOKEN_POOL[:] = msg.data
+
+
+@events.init.add_listener
+def on_locust_init(environment, **kwargs):
+    """Listen for token slices on workers."""
+    if isinstance(environment.runner, WorkerRunner):
+        environment.runner.register_message("tokens", on_tokens_message)
+
+
+def load_token_pool(path):
+    """Read pre-issued tokens from a JSON fixture file."""
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
+
 # Event hooks for reporting
 @events.test_start.add_listener
 def on_test_start(environment, **kwargs):
@@ -317,6 +396,20 @@ def on_test_start(environment, **kwargs):
     print("Stario Platform Load Test Starting")
     print("=" * 60)
 
+    token_file = environment.parsed_options.token_file if environment.parsed_options else ""
+    if not token_file or isinstance(environment.runner, WorkerRunner):
+        return
+
+    tokens = load_token_pool(token_file)
+    print(f"Loaded {len(tokens)} tokens from {token_file}")
+
+    if isinstance(environment.runner, MasterRunner):
+        workers = list(environment.runner.clients)
+        for i, worker_id in enumerate(workers):
+            environment.runner.send_message("tokens", tokens[i::len(workers)], worker_id)
+    elif isinstance(environment.runner, LocalRunner):
+        TOKEN_POOL[:] = tokens
+
 
 @events.test_stop.add_listener
 def on_test_stop(environment, **kwargs):
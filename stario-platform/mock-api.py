@@ -1,12 +1,18 @@
 """
 Mock API for Stario Platform - serves artists data
-Run: python mock-api.py
+Run: python mock-api.py (needs uvicorn[standard] for uvloop and httptools)
 """
-from fastapi import FastAPI
+import os
+from collections import defaultdict
+from functools import lru_cache
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+import orjson
 import uvicorn
 
-app = FastAPI(title="Stario Mock API")
+app = FastAPI(title="Stario Mock API", default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -25,43 +31,80 @@ ARTISTS = [
     {"id": "7", "name": "Лола Юлдашева", "description": "Звезда эстрады", "image": "/celebrities/lola_yuldasheva.jpg", "category": "pop", "gender": "female", "price": 420000, "followers": "780K", "is_verified": True, "is_popular": True, "status": "active", "email": None, "phone": None, "created_at": "2024-01-01", "updated_at": "2024-01-01"},
 ]
 
-@app.get("/")
-def root():
-    return {"status": "ok", "service": "Stario Mock API"}
+# ARTISTS never changes, so filters are answered from positions indexed at
+# startup and each distinct /artists query is serialized once
+ALL_POSITIONS = frozenset(range(len(ARTISTS)))
+INDEX = {"category": defaultdict(set), "gender": defaultdict(set)}
+# Casefolded names for search, kept apart from ARTISTS so they are not serialized
+NAMES_CASEFOLDED = tuple(artist["name"].casefold() for artist in ARTISTS)
+for position, artist in enumerate(ARTISTS):
+    INDEX["category"][artist["category"]].add(position)
+    INDEX["gender"][artist["gender"]].add(position)
 
-@app.get("/artists")
-def get_artists(page: int = 1, page_size: int = 10, category: str = None, gender: str = None, search: str = None):
-    filtered = ARTISTS
+@lru_cache(maxsize=256)
+def artists_page(page: int, page_size: int, category: str, gender: str, search: str) -> bytes:
+    positions = ALL_POSITIONS
     if category:
-        filtered = [a for a in filtered if a["category"] == category]
+        positions = positions & INDEX["category"].get(category, set())
     if gender:
-        filtered = [a for a in filtered if a["gender"] == gender]
+        positions = positions & INDEX["gender"].get(gender, set())
     if search:
-        filtered = [a for a in filtered if search.lower() in a["name"].lower()]
+        positions = (p for p in positions if search in NAMES_CASEFOLDED[p])
+    filtered = tuple(ARTISTS[p] for p in sorted(positions))
 
     total = len(filtered)
     start = (page - 1) * page_size
     end = start + page_size
     items = filtered[start:end]
 
-    return {
+    return orjson.dumps({
         "items": items,
         "total": total,
         "page": page,
         "page_size": page_size,
         "total_pages": (total + page_size - 1) // page_size
-    }
+    })
+
+# Constant responses, serialized once
+ROOT_BYTES = orjson.dumps({"status": "ok", "service": "Stario Mock API"})
+STATS_BYTES = orjson.dumps({"total": len(ARTISTS), "active": len(ARTISTS), "pending": 0, "suspended": 0, "verified": 6, "popular": 5})
+STATIC_HEADERS = {"Cache-Control": "public, max-age=60"}
+ARTIST_JSON_BY_ID = {artist["id"]: orjson.dumps(artist) for artist in ARTISTS}
+NOT_FOUND_BYTES = orjson.dumps({"error": "Not found"})
+
+@app.get("/")
+async def root() -> Response:
+    return Response(content=ROOT_BYTES, media_type="application/json", headers=STATIC_HEADERS)
+
+@app.get("/artists")
+def get_artists(page: int = 1, page_size: int = 10, category: str = None, gender: str = None, search: str = None) -> Response:
+    return Response(
+        content=artists_page(page, page_size, category, gender, search.casefold() if search else None),
+        media_type="application/json",
+    )
 
 @app.get("/artists/stats")
-def get_stats():
-    return {"total": len(ARTISTS), "active": len(ARTISTS), "pending": 0, "suspended": 0, "verified": 6, "popular": 5}
+async def get_stats() -> Response:
+    return Response(content=STATS_BYTES, media_type="application/json", headers=STATIC_HEADERS)
 
 @app.get("/artists/{artist_id}")
-def get_artist(artist_id: str):
-    for a in ARTISTS:
-        if a["id"] == artist_id:
-            return a
-    return {"error": "Not found"}
+async def get_artist(artist_id: str) -> Response:
+    content = ARTIST_JSON_BY_ID.get(artist_id)
+    if content is None:
+        return Response(content=NOT_FOUND_BYTES, status_code=404, media_type="application/json")
+    return Response(content=content, media_type="application/json")
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Workers need an import string; the hyphenated file name still imports
+    # by name from its own directory
+    uvicorn.run(
+        "mock-api:app",
+        app_dir=os.path.dirname(os.path.abspath(__file__)),
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=os.cpu_count(),
+        access_log=False,
+        log_level="warning",
+    )
@@ -0,0 +1,53 @@
+"""
+In-process cache in front of Redis for hot, rarely changing keys.
+
+Reads within the TTL skip the Redis round-trip. Writers call
+``invalidate()``, which publishes the key so every gateway worker drops
+its local copy at once instead of serving it until the TTL runs out.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable
+
+from cachetools import TTLCache
+
+from stario_common.logging import get_logger
+from stario_common.redis_client import get_redis
+
+logger = get_logger(__name__)
+
+LOCAL_CACHE_INVALIDATE_CHANNEL = "local_cache:invalidate"
+
+_local: TTLCache = TTLCache(maxsize=1024, ttl=30)
+
+
+async def local_cached(key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+    """Return the value under ``key``, calling ``loader`` on a local miss."""
+    try:
+        return _local[key]
+    except KeyError:
+        pass
+    value = await loader()
+    _local[key] = value
+    return value
+
+
+async def invalidate(key: str) -> None:
+    """Drop ``key`` from this worker's cache and tell every other worker to."""
+    _local.pop(key, None)
+    redis = await get_redis()
+    await redis.publish(LOCAL_CACHE_INVALIDATE_CHANNEL, key)
+
+
+async def listen_for_invalidations() -> None:
+    """Drop keys invalidated by any worker. Runs for the app's lifetime."""
+    redis = await get_redis()
+    while True:
+        try:
+            async for key in redis.subscribe(LOCAL_CACHE_INVALIDATE_CHANNEL):
+                _local.pop(key, None)
+        except Exception as e:
+            # Invalidations sent while disconnected are lost; start clean
+            _local.clear()
+            logger.error("Local cache invalidation listener error", error=str(e))
+            await asyncio.sleep(1)
@@ -2,14 +2,15 @@
 Stario API Gateway - FastAPI Application
 """
 
+import asyncio
 import time
-import uuid
+from collections import deque
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
+from anyio import to_thread
 from fastapi import FastAPI, Request, Response
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from prometheus_client import make_asgi_app
 
 from stario_common.config import get_settings
@@ -19,6 +20,18 @@ from stario_common.logging import get_logger, setup_logging
 from stario_common.metrics import get_metrics
 from stario_common.redis_client import get_redis
 
+from .local_cache import listen_for_invalidations
+from .middleware import (
+    RATE_LIMIT_FLUSH_SECONDS,
+    RATE_LIMIT_WINDOW_SECONDS,
+    REQUEST_ID,
+    UUID_POOL_REFILL_SECONDS,
+    FastCORS,
+    StarioMiddleware,
+    fill_uuid_pool,
+    flush_local_buckets,
+)
+from .routing import orjson_dumps
 from .routers import (
     artists,
     auth,
@@ -38,26 +51,68 @@ setup_logging("api-gateway")
 logger = get_logger(__name__)
 settings = get_settings()
 
+# Worker threads for blocking calls (password hashing, sync endpoints);
+# anyio's default is 40
+THREADPOOL_SIZE = 64
+
+
+async def prune_local_buckets(app: FastAPI) -> None:
+    """Periodically drop local rate-limit buckets whose window has passed."""
+    while True:
+        await asyncio.sleep(RATE_LIMIT_WINDOW_SECONDS)
+        cutoff = time.monotonic() - RATE_LIMIT_WINDOW_SECONDS
+        buckets = app.state.local_buckets
+        for key in [key for key, (_, window_start, _) in buckets.items() if window_start <= cutoff]:
+            del buckets[key]
+
+
+async def flush_rate_limits(app: FastAPI) -> None:
+    """Periodically add locally admitted requests to the Redis rate-limit windows."""
+    while True:
+        await asyncio.sleep(RATE_LIMIT_FLUSH_SECONDS)
+        try:
+            await flush_local_buckets(app.state.local_buckets)
+        except Exception as e:
+            logger.error("Rate limit flush failed", error=str(e))
+
+
+async def refill_uuid_pool(app: FastAPI) -> None:
+    """Keep the request ID pool topped up."""
+    while True:
+        await asyncio.sleep(UUID_POOL_REFILL_SECONDS)
+        fill_uuid_pool(app.state.uuid_pool)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan events."""
     logger.info("Starting API Gateway", version="1.0.0", environment=settings.environment)
 
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+
     # Initialize connections
     await get_redis()
     db = get_db()
     await db.create_tables()
 
-    # Initialize metrics
-    get_metrics("api-gateway")
+    prune_task = asyncio.create_task(prune_local_buckets(app))
+    flush_task = asyncio.create_task(flush_rate_limits(app))
+    uuid_task = asyncio.create_task(refill_uuid_pool(app))
+    invalidation_task = asyncio.create_task(listen_for_invalidations())
+    readiness_task = asyncio.create_task(health.refresh_readiness())
 
     yield
 
     # Cleanup
+    prune_task.cancel()
+    flush_task.cancel()
+    uuid_task.cancel()
+    invalidation_task.cancel()
+    readiness_task.cancel()
     redis = await get_redis()
     await redis.close()
     await db.close()
+    await face_quiz.face_service.aclose()
     logger.info("API Gateway shutdown complete")
 
 
@@ -68,11 +123,22 @@ app = FastAPI(
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+# Metrics collector, bound once so the middleware does not look it up per request
+app.state.metrics = get_metrics("api-gateway")
+
+# Per-worker rate-limit counters: client_key -> (requests, window start)
+app.state.local_buckets = {}
+
+# Precomputed request IDs, handed out by the middleware
+app.state.uuid_pool = deque()
+fill_uuid_pool(app.state.uuid_pool)
+
 # CORS middleware
 app.add_middleware(
-    CORSMiddleware,
+    FastCORS,
     allow_origins=["*"] if settings.debug else [
         "https://stario.uz",
         "https://app.stario.uz",
@@ -84,74 +150,27 @@ app.add_middleware(
 )
 
 
-# Request ID middleware
-@app.middleware("http")
-async def add_request_id(request: Request, call_next):
-    request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
-    request.state.request_id = request_id
-
-    response = await call_next(request)
-    response.headers["X-Request-ID"] = request_id
-    return response
-
-
-# Metrics middleware
-@app.middleware("http")
-async def metrics_middleware(request: Request, call_next):
-    start_time = time.time()
-    response = await call_next(request)
-    duration = time.time() - start_time
-
-    # Track metrics
-    metrics = get_metrics()
-    metrics.track_request(
-        method=request.method,
-        endpoint=request.url.path,
-        status=response.status_code,
-        duration=duration,
-    )
-
-    # Add timing header
-    response.headers["X-Response-Time"] = f"{duration:.3f}s"
-    return response
-
-
-# Rate limiting middleware
-@app.middleware("http")
-async def rate_limit_middleware(request: Request, call_next):
-    if request.url.path.startswith("/health") or request.url.path.startswith("/metrics"):
-        return await call_next(request)
-
-    # Get client identifier
-    client_ip = request.client.host if request.client else "unknown"
-    user_id = getattr(request.state, "user_id", None)
-    client_key = f"rate_limit:{user_id or client_ip}"
+# Healthchecks and metrics scrapes, served without any middleware
+probe_app = FastAPI(
+    docs_url=None,
+    redoc_url=None,
+    openapi_url=None,
+    default_response_class=ORJSONResponse,
+)
+probe_app.include_router(health.router, prefix="/health", tags=["Health"])
+probe_app.mount("/metrics", make_asgi_app())
 
-    # Check rate limit
-    redis = await get_redis()
-    allowed, remaining = await redis.check_rate_limit(
-        client_key,
-        max_requests=settings.rate_limit_requests_per_minute,
-        window_seconds=60,
-    )
+# Request ID, timing, metrics and rate limiting
+app.add_middleware(StarioMiddleware, probe_app=probe_app)
 
-    if not allowed:
-        return JSONResponse(
-            status_code=429,
-            content={
-                "error": "RATE_LIMIT_EXCEEDED",
-                "message": "Too many requests. Please try again later.",
-                "retry_after_seconds": 60,
-            },
-            headers={"Retry-After": "60"},
-        )
 
-    response = await call_next(request)
-    response.headers["X-RateLimit-Remaining"] = str(remaining)
-    return response
+# Exception handlers
+INTERNAL_ERROR_BYTES = orjson_dumps({
+    "error": "INTERNAL_ERROR",
+    "message": "An unexpected error occurred",
+})
 
 
-# Exception handlers
 @app.exception_handler(StarioException)
 async def stario_exception_handler(request: Request, exc: StarioException):
     logger.error(
@@ -159,11 +178,12 @@ async def stario_exception_handler(request: Request, exc: StarioException):
         error_code=exc.error_code,
         message=exc.message,
         details=exc.details,
-        request_id=getattr(request.state, "request_id", None),
+        request_id=REQUEST_ID.get(),
     )
-    return JSONResponse(
+    return Response(
+        content=orjson_dumps(exc.to_dict()),
         status_code=exc.status_code,
-        content=exc.to_dict(),
+        media_type="application/json",
     )
 
 
@@ -172,23 +192,16 @@ async def general_exception_handler(request: Request, exc: Exception):
     logger.exception(
         "unhandled_error",
         error=str(exc),
-        request_id=getattr(request.state, "request_id", None),
+        request_id=REQUEST_ID.get(),
     )
-    return JSONResponse(
+    return Response(
+        content=INTERNAL_ERROR_BYTES,
         status_code=500,
-        content={
-            "error": "INTERNAL_ERROR",
-            "message": "An unexpected error occurred",
-        },
+        media_type="application/json",
     )
 
 
-# Mount Prometheus metrics
-metrics_app = make_asgi_app()
-app.mount("/metrics", metrics_app)
-
 # Include routers
-app.include_router(health.router, prefix="/health", tags=["Health"])
 app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 app.include_router(users.router, prefix="/users", tags=["Users"])
 app.include_router(artists.router, prefix="/artists", tags=["Artists"])
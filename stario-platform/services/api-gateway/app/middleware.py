@@ -0,0 +1,202 @@
+"""
+Request middleware for the API Gateway.
+"""
+
+import os
+import time
+import uuid
+from collections import deque
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import Response
+from starlette.datastructures import Headers
+from starlette.middleware.cors import CORSMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from stario_common.config import get_settings
+from stario_common.redis_client import get_redis
+
+from .routing import orjson_dumps
+
+RATE_LIMIT_WINDOW_SECONDS = 60
+# Clients below this fraction of their limit (as seen by this worker) are
+# admitted without asking Redis
+LOCAL_RATE_LIMIT_FRACTION = 0.5
+# Requests admitted locally are added to the Redis windows this often
+RATE_LIMIT_FLUSH_SECONDS = 1
+
+RATE_LIMIT_BYTES = orjson_dumps({
+    "error": "RATE_LIMIT_EXCEEDED",
+    "message": "Too many requests. Please try again later.",
+    "retry_after_seconds": RATE_LIMIT_WINDOW_SECONDS,
+})
+
+# Healthchecks and Prometheus scrapes are handed to the probe app untouched:
+# no request ID, rate limiting, metrics or CORS
+PROBE_PREFIXES = ("/health", "/metrics")
+
+# ID of the request being handled. Not reset on the way out: servers run each
+# request in its own task, and the 500 handler (outside this middleware) still
+# needs it.
+REQUEST_ID: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Request IDs are drawn from a pool refilled in batches off the request path
+UUID_POOL_SIZE = 4096
+UUID_POOL_REFILL_SECONDS = 1
+
+
+def fill_uuid_pool(pool: deque[str], size: int = UUID_POOL_SIZE) -> None:
+    """Top the pool up to ``size`` UUID4 strings from a single urandom read."""
+    missing = size - len(pool)
+    if missing <= 0:
+        return
+    random_bytes = os.urandom(16 * missing)
+    pool.extend(
+        str(uuid.UUID(bytes=random_bytes[i:i + 16], version=4))
+        for i in range(0, len(random_bytes), 16)
+    )
+
+
+async def flush_local_buckets(buckets: dict[str, tuple[int, float, int]]) -> None:
+    """Add the requests admitted locally since the last flush to Redis."""
+    counts = {}
+    for key, (local_count, window_start, unreported) in buckets.items():
+        if unreported:
+            counts[key] = unreported
+            buckets[key] = (local_count, window_start, 0)
+    if not counts:
+        return
+    redis = await get_redis()
+    try:
+        await redis.record_requests(counts, RATE_LIMIT_WINDOW_SECONDS)
+    except Exception:
+        # Keep them for the next flush rather than losing them
+        for key, count in counts.items():
+            if key in buckets:
+                local_count, window_start, unreported = buckets[key]
+                buckets[key] = (local_count, window_start, unreported + count)
+        raise
+
+
+class FastCORS(CORSMiddleware):
+    """CORSMiddleware that lets requests without an Origin header straight through.
+
+    Internal callers never send Origin, so they skip building a Headers
+    object and the CORS checks entirely.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            for name, _ in scope["headers"]:
+                if name == b"origin":
+                    break
+            else:
+                await self.app(scope, receive, send)
+                return
+        await super().__call__(scope, receive, send)
+
+
+class StarioMiddleware:
+    """Request ID, rate limiting, timing and metrics in one pure ASGI pass.
+
+    Requests under PROBE_PREFIXES go straight to ``probe_app``, bypassing
+    this and every inner middleware. Expects ``app.state.metrics``, ``app.state.local_buckets`` and
+    ``app.state.uuid_pool`` to be set on the application.
+    """
+
+    def __init__(self, app: ASGIApp, probe_app: ASGIApp) -> None:
+        self.app = app
+        self.probe_app = probe_app
+        self.settings = get_settings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        if path.startswith(PROBE_PREFIXES):
+            await self.probe_app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        state = scope["app"].state
+
+        request_id = Headers(scope=scope).get("x-request-id")
+        if not request_id:
+            pool = state.uuid_pool
+            request_id = pool.popleft() if pool else str(uuid.uuid4())
+        REQUEST_ID.set(request_id)
+
+        client_ip = scope["client"][0] if scope.get("client") else "unknown"
+        user_id = scope.get("state", {}).get("user_id")
+        allowed, remaining = await self.check_rate_limit(
+            state.local_buckets, f"rate_limit:{user_id or client_ip}"
+        )
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                duration = time.perf_counter() - start_time
+                state.metrics.track_request(
+                    method=scope["method"],
+                    endpoint=path,
+                    status=message["status"],
+                    duration=duration,
+                )
+
+                # Appended in one go; nothing further in sets these headers
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (b"x-request-id", request_id.encode("latin-1")),
+                    (b"x-response-time", f"{duration:.3f}s".encode("latin-1")),
+                    (b"x-ratelimit-remaining", str(remaining).encode("latin-1")),
+                ]
+            await send(message)
+
+        if not allowed:
+            response = Response(
+                content=RATE_LIMIT_BYTES,
+                status_code=429,
+                headers={"Retry-After": str(RATE_LIMIT_WINDOW_SECONDS)},
+                media_type="application/json",
+            )
+            await response(scope, receive, send_wrapper)
+            return
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def check_rate_limit(
+        self, buckets: dict[str, tuple[int, float, int]], client_key: str
+    ) -> tuple[bool, int]:
+        """Check the client's rate limit. Returns (allowed, remaining).
+
+        Requests are counted locally first; only clients nearing their limit
+        cost a Redis round-trip. Locally admitted requests are still added
+        to the client's Redis window, by flush_local_buckets() and in one
+        batch when the client next reaches Redis, so Redis counts every
+        request. What remains is the lag until they arrive there: a client
+        spreading its requests thinly enough to stay below
+        LOCAL_RATE_LIMIT_FRACTION on every worker can overshoot by up to
+        that fraction of its limit per worker.
+        """
+        max_requests = self.settings.rate_limit_requests_per_minute
+        now = time.monotonic()
+        local_count, window_start, unreported = buckets.get(client_key, (0, now, 0))
+        if now - window_start >= RATE_LIMIT_WINDOW_SECONDS:
+            local_count, window_start = 0, now
+        local_count += 1
+
+        if local_count < max_requests * LOCAL_RATE_LIMIT_FRACTION:
+            buckets[client_key] = (local_count, window_start, unreported + 1)
+            return True, max_requests - local_count
+
+        # This request is counted by Redis itself, along with the backlog
+        buckets[client_key] = (local_count, window_start, 0)
+        redis = await get_redis()
+        return await redis.check_rate_limit(
+            client_key,
+            max_requests=max_requests,
+            window_seconds=RATE_LIMIT_WINDOW_SECONDS,
+            admitted=unreported,
+        )
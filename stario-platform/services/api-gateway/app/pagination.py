@@ -0,0 +1,37 @@
+"""
+Keyset pagination cursors shared by the list endpoints.
+
+A cursor marks the last row of a page by its (timestamp, id) sort key, so
+the next page is an index seek past it instead of an OFFSET scan.
+"""
+
+import base64
+import binascii
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+import orjson
+from fastapi import HTTPException, status
+
+
+# Response header carrying the cursor for list endpoints that return a bare array
+NEXT_CURSOR_HEADER = "x-next-cursor"
+
+
+def encode_cursor(timestamp: datetime, row_id: Any) -> str:
+    """Opaque cursor for the position right after the row (timestamp, row_id)."""
+    raw = orjson.dumps([timestamp.isoformat(), str(row_id)])
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decode a cursor from encode_cursor() into (timestamp, id)."""
+    try:
+        timestamp, row_id = orjson.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(timestamp), UUID(row_id)
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
@@ -2,17 +2,23 @@
 
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Callable, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from pydantic import BaseModel, Field
-from sqlalchemy import text
+from sqlalchemy import TextClause, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from stario_common.database import get_session
+from stario_common.redis_client import get_redis
 
-router = APIRouter()
+from ..pagination import decode_cursor, encode_cursor
+from ..routing import FastJSONRoute, orjson_dumps
+
+router = APIRouter(route_class=FastJSONRoute)
 
 
 # Pydantic Schemas - frontend-compatible
@@ -89,6 +95,7 @@ class ArtistListResponse(BaseModel):
     page: int
     page_size: int
     total_pages: int
+    next_cursor: Optional[str] = None
 
 
 class ArtistStats(BaseModel):
@@ -100,84 +107,207 @@ class ArtistStats(BaseModel):
     popular: int
 
 
-def row_to_artist_response(row) -> ArtistResponse:
-    """Convert database row to ArtistResponse."""
-    return ArtistResponse(
-        id=str(row.id),
-        name=row.name,
-        stage_name=row.stage_name,
-        bio=row.bio,
-        category=row.category,
-        country=row.country,
-        avatar_url=row.avatar_url,
-        cover_url=row.cover_url,
-        source_image_url=row.source_image_url,
-        voice_model_id=row.voice_model_id,
-        verification_status=row.verification_status,
-        is_active=row.is_active,
-        total_videos=row.total_videos or 0,
-        total_orders=row.total_orders or 0,
-        rating=float(row.rating) if row.rating else 0.0,
-        created_at=row.created_at,
-        updated_at=row.updated_at,
+# Columns read by row_to_artist_dict; everything else stays in the database
+ARTIST_COLUMNS = (
+    "id, name, stage_name, bio, category, country, avatar_url, cover_url, "
+    "source_image_url, voice_model_id, verification_status, is_active, "
+    "total_videos, total_orders, rating, created_at, updated_at"
+)
+
+
+def row_to_artist_dict(row) -> dict:
+    """Convert database row to a plain dict with the ArtistResponse fields."""
+    return {
+        "id": str(row.id),
+        "name": row.name,
+        "stage_name": row.stage_name,
+        "bio": row.bio,
+        "category": row.category,
+        "country": row.country,
+        "avatar_url": row.avatar_url,
+        "cover_url": row.cover_url,
+        "source_image_url": row.source_image_url,
+        "voice_model_id": row.voice_model_id,
+        "verification_status": row.verification_status,
+        "is_active": row.is_active,
+        "total_videos": row.total_videos or 0,
+        "total_orders": row.total_orders or 0,
+        "rating": float(row.rating) if row.rating else 0.0,
+        "created_at": row.created_at,
+        "updated_at": row.updated_at,
         # Frontend compatibility
-        image=row.avatar_url,
-        description=row.bio,
-        is_verified=row.verification_status == "approved",
-        is_popular=row.total_orders > 100 if row.total_orders else False,
-        status="active" if row.is_active else "pending",
-    )
+        "image": row.avatar_url,
+        "description": row.bio,
+        "gender": "male",
+        "price": 50000,
+        "followers": "0",
+        "is_verified": row.verification_status == "approved",
+        "is_popular": row.total_orders > 100 if row.total_orders else False,
+        "status": "active" if row.is_active else "pending",
+        "email": None,
+        "phone": None,
+    }
 
 
-@router.get("/stats", response_model=ArtistStats)
-async def get_artists_stats(
-    session: AsyncSession = Depends(get_session),
-):
-    """Get artist statistics."""
-    # Total count
-    total_result = await session.execute(
-        text("SELECT COUNT(*) FROM artists WHERE deleted_at IS NULL")
-    )
-    total = total_result.scalar() or 0
+def row_to_artist_response(row) -> ArtistResponse:
+    """Convert database row to ArtistResponse.
+
+    row_to_artist_dict already produces the field types, so the trusted row
+    is not validated again.
+    """
+    return ArtistResponse.model_construct(**row_to_artist_dict(row))
+
+
+# Statements, built once per process
+STATS_SQL = text("""
+    SELECT
+        COUNT(*) AS total,
+        COUNT(*) FILTER (WHERE is_active = true) AS active,
+        COUNT(*) FILTER (WHERE verification_status = 'pending') AS pending,
+        COUNT(*) FILTER (WHERE is_active = false AND verification_status != 'pending') AS suspended,
+        COUNT(*) FILTER (WHERE verification_status = 'approved') AS verified,
+        COUNT(*) FILTER (WHERE total_orders > 100) AS popular
+    FROM artists
+    WHERE deleted_at IS NULL
+""")
+COUNT_ARTISTS_SQL = text("SELECT COUNT(*) FROM artists WHERE deleted_at IS NULL")
+GET_ARTIST_SQL = text(f"SELECT {ARTIST_COLUMNS} FROM artists WHERE id = :id AND deleted_at IS NULL")
+CREATE_ARTIST_SQL = text(f"""
+    INSERT INTO artists (name, bio, category, avatar_url, verification_status, is_active, total_orders)
+    VALUES (:name, :bio, :category, :avatar_url, :verification_status, :is_active, :total_orders)
+    RETURNING {ARTIST_COLUMNS}
+""")
+DELETE_ARTIST_SQL = text(
+    "UPDATE artists SET deleted_at = NOW() WHERE id = :id AND deleted_at IS NULL RETURNING id"
+)
+SET_VERIFICATION_SQL = text(f"""
+    UPDATE artists
+    SET verification_status = :status, updated_at = NOW()
+    WHERE id = :id AND deleted_at IS NULL
+    RETURNING {ARTIST_COLUMNS}
+""")
+SET_TOTAL_ORDERS_SQL = text(f"""
+    UPDATE artists
+    SET total_orders = :total_orders, updated_at = NOW()
+    WHERE id = :id AND deleted_at IS NULL
+    RETURNING {ARTIST_COLUMNS}
+""")
+SET_STATUS_SQL = text(f"""
+    UPDATE artists
+    SET is_active = :is_active, updated_at = NOW()
+    WHERE id = :id AND deleted_at IS NULL
+    RETURNING {ARTIST_COLUMNS}
+""")
+SET_STATUS_AND_VERIFICATION_SQL = text(f"""
+    UPDATE artists
+    SET is_active = :is_active, verification_status = :verification_status, updated_at = NOW()
+    WHERE id = :id AND deleted_at IS NULL
+    RETURNING {ARTIST_COLUMNS}
+""")
+
+
+@lru_cache(maxsize=64)
+def list_artists_sql(where_sql: str, estimate_total: bool, seek: bool) -> TextClause:
+    """Total and page of the artist list in one statement.
+
+    With ``estimate_total``, the planner's row estimate stands in for the
+    total above :estimate_above rows; the CASE only runs the exact COUNT
+    below it. With ``seek``, the page starts after (:cursor_ts, :cursor_id).
+    The LEFT JOIN still yields a row (all NULL but total_count) when the
+    page is empty.
+    """
+    total_sql = f"SELECT COUNT(*) FROM artists WHERE {where_sql}"
+    if estimate_total:
+        total_sql = f"""
+            SELECT CASE WHEN reltuples > :estimate_above THEN reltuples::bigint
+                        ELSE ({total_sql}) END
+            FROM pg_class WHERE oid = 'artists'::regclass
+        """
+    page_where_sql = where_sql
+    if seek:
+        page_where_sql += " AND (created_at, id) < (:cursor_ts, :cursor_id)"
+    return text(f"""
+        WITH page AS (
+            SELECT {ARTIST_COLUMNS} FROM artists
+            WHERE {page_where_sql}
+            ORDER BY created_at DESC, id DESC
+            LIMIT :limit OFFSET :offset
+        )
+        SELECT ({total_sql}) AS total_count, page.*
+        FROM (SELECT 1) AS one
+        LEFT JOIN page ON true
+        ORDER BY page.created_at DESC, page.id DESC
+    """)
 
-    # Active count
-    active_result = await session.execute(
-        text("SELECT COUNT(*) FROM artists WHERE deleted_at IS NULL AND is_active = true")
-    )
-    active = active_result.scalar() or 0
 
-    # Pending count
-    pending_result = await session.execute(
-        text("SELECT COUNT(*) FROM artists WHERE deleted_at IS NULL AND verification_status = 'pending'")
+# Frontend field -> (database column, value conversion) for update_artist.
+# Iterated in this order, so each set of changed fields maps to one statement
+ARTIST_UPDATE_FIELDS: dict[str, tuple[str, Callable[[Any], Any]]] = {
+    "name": ("name", lambda value: value),
+    "description": ("bio", lambda value: value),
+    "image": ("avatar_url", lambda value: value),
+    "category": ("category", lambda value: value),
+    "status": ("is_active", lambda value: value == "active"),
+    "is_verified": ("verification_status", lambda value: "approved" if value else "pending"),
+    "is_popular": ("total_orders", lambda value: 101 if value else 0),
+}
+
+
+@lru_cache(maxsize=64)
+def update_artist_sql(update_sql: str) -> TextClause:
+    """UPDATE for one combination of changed fields."""
+    return text(
+        f"UPDATE artists SET {update_sql} WHERE id = :id AND deleted_at IS NULL RETURNING {ARTIST_COLUMNS}"
     )
-    pending = pending_result.scalar() or 0
 
-    # Suspended count (inactive)
-    suspended_result = await session.execute(
-        text("SELECT COUNT(*) FROM artists WHERE deleted_at IS NULL AND is_active = false AND verification_status != 'pending'")
-    )
-    suspended = suspended_result.scalar() or 0
 
-    # Verified count
-    verified_result = await session.execute(
-        text("SELECT COUNT(*) FROM artists WHERE deleted_at IS NULL AND verification_status = 'approved'")
+def json_response(payload) -> Response:
+    """Serialize a plain payload with orjson, skipping jsonable_encoder and
+    response_model validation (used on the hot read paths)."""
+    return Response(
+        content=orjson_dumps(payload),
+        media_type="application/json",
     )
-    verified = verified_result.scalar() or 0
 
-    # Popular count (total_orders > 100)
-    popular_result = await session.execute(
-        text("SELECT COUNT(*) FROM artists WHERE deleted_at IS NULL AND total_orders > 100")
+
+# Unfiltered artist lists report an estimated total above this many rows
+ARTIST_COUNT_ESTIMATE_ABOVE = 10_000
+
+
+# Rendered list pages (one hash field per query), single artists (one hash
+# field per id) and stats. All are dropped on any artist write
+ARTIST_LIST_CACHE_KEY = "artists:list"
+ARTIST_LIST_CACHE_TTL_SECONDS = 30
+ARTIST_DETAIL_CACHE_KEY = "artists:detail"
+ARTIST_DETAIL_CACHE_TTL_SECONDS = 30
+ARTIST_STATS_CACHE_KEY = "artists:stats"
+ARTIST_STATS_CACHE_TTL_SECONDS = 30
+
+
+async def invalidate_artist_caches() -> None:
+    """Drop cached artist list pages, single artists and stats."""
+    redis = await get_redis()
+    await redis.cache_delete(
+        ARTIST_LIST_CACHE_KEY, ARTIST_DETAIL_CACHE_KEY, ARTIST_STATS_CACHE_KEY
     )
-    popular = popular_result.scalar() or 0
-
-    return ArtistStats(
-        total=total,
-        active=active,
-        pending=pending,
-        suspended=suspended,
-        verified=verified,
-        popular=popular,
+
+
+@router.get("/stats", response_model=ArtistStats)
+async def get_artists_stats(
+    session: AsyncSession = Depends(get_session),
+):
+    """Get artist statistics."""
+    redis = await get_redis()
+    cached = await redis.cache_get(ARTIST_STATS_CACHE_KEY)
+    if cached is not None:
+        return ArtistStats(**cached)
+
+    result = await session.execute(STATS_SQL)
+    stats = ArtistStats(**result.one()._mapping)
+    await redis.cache_set(
+        ARTIST_STATS_CACHE_KEY, stats.model_dump(), ARTIST_STATS_CACHE_TTL_SECONDS
     )
+    return stats
 
 
 @router.get("", response_model=ArtistListResponse)
@@ -188,9 +318,24 @@ async def list_artists(
     is_verified: Optional[bool] = Query(None, description="Filter by verification"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; overrides page"),
     session: AsyncSession = Depends(get_session),
 ):
-    """List all artists with filtering and pagination."""
+    """List all artists with filtering and pagination.
+
+    Pass the returned ``next_cursor`` back as ``cursor`` to walk the list:
+    each page is then a single index seek, however deep. ``page`` (OFFSET)
+    stays available for jumping to an arbitrary page.
+    """
+    # Keyed on the query alone: the list is the same for every caller
+    cache_field = orjson.dumps(
+        [category, status, search, is_verified, page, page_size, cursor]
+    ).decode()
+    redis = await get_redis()
+    cached = await redis.cache_hget(ARTIST_LIST_CACHE_KEY, cache_field)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
     # Build query
     where_clauses = ["deleted_at IS NULL"]
     params = {}
@@ -219,34 +364,38 @@ async def list_artists(
 
     where_sql = " AND ".join(where_clauses)
 
-    # Count total
-    count_query = text(f"SELECT COUNT(*) FROM artists WHERE {where_sql}")
-    total_result = await session.execute(count_query, params)
-    total = total_result.scalar() or 0
-
-    # Get paginated results
-    offset = (page - 1) * page_size
-    query = text(f"""
-        SELECT * FROM artists
-        WHERE {where_sql}
-        ORDER BY created_at DESC
-        LIMIT :limit OFFSET :offset
-    """)
+    estimate_total = len(where_clauses) == 1
+    if estimate_total:
+        params["estimate_above"] = ARTIST_COUNT_ESTIMATE_ABOVE
+    if cursor:
+        params["cursor_ts"], params["cursor_id"] = decode_cursor(cursor)
+        params["offset"] = 0
+    else:
+        params["offset"] = (page - 1) * page_size
     params["limit"] = page_size
-    params["offset"] = offset
 
+    query = list_artists_sql(where_sql, estimate_total, seek=bool(cursor))
     result = await session.execute(query, params)
     rows = result.fetchall()
+    total = rows[0].total_count
+    # An empty page comes back as the single all-NULL row of the LEFT JOIN
+    if rows[0].id is None:
+        rows = []
 
     total_pages = (total + page_size - 1) // page_size if total > 0 else 1
 
-    return ArtistListResponse(
-        items=[row_to_artist_response(row) for row in rows],
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages,
+    response = json_response({
+        "items": [row_to_artist_dict(row) for row in rows],
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": total_pages,
+        "next_cursor": encode_cursor(rows[-1].created_at, rows[-1].id) if len(rows) == page_size else None,
+    })
+    await redis.cache_hset(
+        ARTIST_LIST_CACHE_KEY, cache_field, response.body, ARTIST_LIST_CACHE_TTL_SECONDS
     )
+    return response
 
 
 @router.get("/{artist_id}", response_model=ArtistResponse)
@@ -263,9 +412,15 @@ async def get_artist(
             detail="Invalid artist ID format"
         )
 
+    cache_field = str(uuid_id)
+    redis = await get_redis()
+    cached = await redis.cache_hget(ARTIST_DETAIL_CACHE_KEY, cache_field)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
     result = await session.execute(
-        text("SELECT * FROM artists WHERE id = :id AND deleted_at IS NULL"),
-        {"id": str(uuid_id)}
+        GET_ARTIST_SQL,
+        {"id": uuid_id}
     )
     row = result.fetchone()
 
@@ -275,7 +430,11 @@ async def get_artist(
             detail="Artist not found"
         )
 
-    return row_to_artist_response(row)
+    response = json_response(row_to_artist_dict(row))
+    await redis.cache_hset(
+        ARTIST_DETAIL_CACHE_KEY, cache_field, response.body, ARTIST_DETAIL_CACHE_TTL_SECONDS
+    )
+    return response
 
 
 @router.post("", response_model=ArtistResponse, status_code=status.HTTP_201_CREATED)
@@ -290,11 +449,7 @@ async def create_artist(
     total_orders = 101 if request.is_popular else 0
 
     result = await session.execute(
-        text("""
-            INSERT INTO artists (name, bio, category, avatar_url, verification_status, is_active, total_orders)
-            VALUES (:name, :bio, :category, :avatar_url, :verification_status, :is_active, :total_orders)
-            RETURNING *
-        """),
+        CREATE_ARTIST_SQL,
         {
             "name": request.name,
             "bio": request.description,
@@ -307,6 +462,7 @@ async def create_artist(
     )
     row = result.fetchone()
     await session.commit()
+    await invalidate_artist_caches()
 
     return row_to_artist_response(row)
 
@@ -326,67 +482,44 @@ async def update_artist(
             detail="Invalid artist ID format"
         )
 
-    # Check if artist exists
-    check_result = await session.execute(
-        text("SELECT id FROM artists WHERE id = :id AND deleted_at IS NULL"),
-        {"id": str(uuid_id)}
-    )
-    if not check_result.fetchone():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Artist not found"
-        )
-
     # Map frontend fields to database fields
     update_fields = []
-    params = {"id": str(uuid_id)}
+    params = {"id": uuid_id}
     update_data = request.model_dump(exclude_unset=True)
 
-    # Field mapping from frontend to database
-    field_mapping = {
-        "name": "name",
-        "description": "bio",
-        "image": "avatar_url",
-        "category": "category",
-    }
-
-    for frontend_field, db_field in field_mapping.items():
-        if frontend_field in update_data and update_data[frontend_field] is not None:
+    for frontend_field, (db_field, convert) in ARTIST_UPDATE_FIELDS.items():
+        value = update_data.get(frontend_field)
+        if value is not None:
             update_fields.append(f"{db_field} = :{db_field}")
-            params[db_field] = update_data[frontend_field]
-
-    # Handle status -> is_active mapping
-    if "status" in update_data and update_data["status"] is not None:
-        update_fields.append("is_active = :is_active")
-        params["is_active"] = update_data["status"] == "active"
-
-    # Handle is_verified -> verification_status mapping
-    if "is_verified" in update_data and update_data["is_verified"] is not None:
-        update_fields.append("verification_status = :verification_status")
-        params["verification_status"] = "approved" if update_data["is_verified"] else "pending"
-
-    # Handle is_popular -> total_orders mapping
-    if "is_popular" in update_data and update_data["is_popular"] is not None:
-        update_fields.append("total_orders = :total_orders")
-        params["total_orders"] = 101 if update_data["is_popular"] else 0
+            params[db_field] = convert(value)
 
     if not update_fields:
         # No updates, just return current
         result = await session.execute(
-            text("SELECT * FROM artists WHERE id = :id"),
-            {"id": str(uuid_id)}
+            GET_ARTIST_SQL,
+            {"id": uuid_id}
         )
-        return row_to_artist_response(result.fetchone())
+        row = result.fetchone()
+    else:
+        update_fields.append("updated_at = NOW()")
+        update_sql = ", ".join(update_fields)
 
-    update_fields.append("updated_at = NOW()")
-    update_sql = ", ".join(update_fields)
+        # No match on the UPDATE itself means the artist does not exist
+        result = await session.execute(
+            update_artist_sql(update_sql),
+            params
+        )
+        row = result.fetchone()
 
-    result = await session.execute(
-        text(f"UPDATE artists SET {update_sql} WHERE id = :id RETURNING *"),
-        params
-    )
-    row = result.fetchone()
-    await session.commit()
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Artist not found"
+        )
+
+    if update_fields:
+        await session.commit()
+        await invalidate_artist_caches()
 
     return row_to_artist_response(row)
 
@@ -406,18 +539,19 @@ async def delete_artist(
         )
 
     result = await session.execute(
-        text("UPDATE artists SET deleted_at = NOW() WHERE id = :id AND deleted_at IS NULL RETURNING id"),
-        {"id": str(uuid_id)}
+        DELETE_ARTIST_SQL,
+        {"id": uuid_id}
     )
     row = result.fetchone()
-    await session.commit()
-
     if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Artist not found"
         )
 
+    await session.commit()
+    await invalidate_artist_caches()
+
     return None
 
 
@@ -439,23 +573,19 @@ async def toggle_verification(
     verification_status = "approved" if is_verified else "pending"
 
     result = await session.execute(
-        text("""
-            UPDATE artists
-            SET verification_status = :status, updated_at = NOW()
-            WHERE id = :id AND deleted_at IS NULL
-            RETURNING *
-        """),
-        {"id": str(uuid_id), "status": verification_status}
+        SET_VERIFICATION_SQL,
+        {"id": uuid_id, "status": verification_status}
     )
     row = result.fetchone()
-    await session.commit()
-
     if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Artist not found"
         )
 
+    await session.commit()
+    await invalidate_artist_caches()
+
     return row_to_artist_response(row)
 
 
@@ -478,23 +608,19 @@ async def toggle_popular(
     total_orders = 101 if is_popular else 0
 
     result = await session.execute(
-        text("""
-            UPDATE artists
-            SET total_orders = :total_orders, updated_at = NOW()
-            WHERE id = :id AND deleted_at IS NULL
-            RETURNING *
-        """),
-        {"id": str(uuid_id), "total_orders": total_orders}
+        SET_TOTAL_ORDERS_SQL,
+        {"id": uuid_id, "total_orders": total_orders}
     )
     row = result.fetchone()
-    await session.commit()
-
     if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Artist not found"
         )
 
+    await session.commit()
+    await invalidate_artist_caches()
+
     return row_to_artist_response(row)
 
 
@@ -530,34 +656,25 @@ async def update_status(
 
     if verification_status:
         result = await session.execute(
-            text("""
-                UPDATE artists
-                SET is_active = :is_active, verification_status = :verification_status, updated_at = NOW()
-                WHERE id = :id AND deleted_at IS NULL
-                RETURNING *
-            """),
-            {"id": str(uuid_id), "is_active": is_active, "verification_status": verification_status}
+            SET_STATUS_AND_VERIFICATION_SQL,
+            {"id": uuid_id, "is_active": is_active, "verification_status": verification_status}
         )
     else:
         result = await session.execute(
-            text("""
-                UPDATE artists
-                SET is_active = :is_active, updated_at = NOW()
-                WHERE id = :id AND deleted_at IS NULL
-                RETURNING *
-            """),
-            {"id": str(uuid_id), "is_active": is_active}
+            SET_STATUS_SQL,
+            {"id": uuid_id, "is_active": is_active}
         )
 
     row = result.fetchone()
-    await session.commit()
-
     if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Artist not found"
         )
 
+    await session.commit()
+    await invalidate_artist_caches()
+
     return row_to_artist_response(row)
 
 
@@ -568,7 +685,7 @@ async def seed_artists(
     """Seed initial artists data (for development)."""
     # Check if artists already exist
     result = await session.execute(
-        text("SELECT COUNT(*) FROM artists WHERE deleted_at IS NULL")
+        COUNT_ARTISTS_SQL
     )
     count = result.scalar() or 0
 
@@ -589,29 +706,38 @@ async def seed_artists(
     # Generate avatar URLs
     colors = ['E91E63', '9C27B0', '673AB7', '3F51B5', '2196F3', '00BCD4', '009688', '4CAF50', 'FF9800', 'FF5722']
 
-    created_count = 0
+    # One multi-row INSERT, parameters suffixed with the row index
+    values_sql = []
+    params = {}
     for i, data in enumerate(artists_data):
         initials = ''.join([n[0] for n in data['name'].split()[:2]])
         color = colors[i % len(colors)]
         avatar_url = f"https://ui-avatars.com/api/?name={initials}&size=200&background={color}&color=fff&bold=true&font-size=0.4"
 
-        await session.execute(
-            text("""
-                INSERT INTO artists (name, category, bio, avatar_url, is_active, verification_status, total_orders)
-                VALUES (:name, :category, :bio, :avatar_url, :is_active, :verification_status, :total_orders)
-            """),
-            {
-                "name": data['name'],
-                "category": data['category'],
-                "bio": data['bio'],
-                "avatar_url": avatar_url,
-                "is_active": data.get('is_active', False),
-                "verification_status": data.get('verification_status', 'pending'),
-                "total_orders": data.get('total_orders', 0),
-            }
+        values_sql.append(
+            f"(:name{i}, :category{i}, :bio{i}, :avatar_url{i}, "
+            f":is_active{i}, :verification_status{i}, :total_orders{i})"
         )
-        created_count += 1
+        params.update({
+            f"name{i}": data['name'],
+            f"category{i}": data['category'],
+            f"bio{i}": data['bio'],
+            f"avatar_url{i}": avatar_url,
+            f"is_active{i}": data.get('is_active', False),
+            f"verification_status{i}": data.get('verification_status', 'pending'),
+            f"total_orders{i}": data.get('total_orders', 0),
+        })
+
+    await session.execute(
+        text(
+            "INSERT INTO artists (name, category, bio, avatar_url, is_active, verification_status, total_orders) "
+            "VALUES " + ", ".join(values_sql)
+        ),
+        params
+    )
+    created_count = len(artists_data)
 
     await session.commit()
+    await invalidate_artist_caches()
 
     return {"message": f"Successfully seeded {created_count} artists", "created": created_count}
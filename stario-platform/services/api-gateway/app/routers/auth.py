@@ -1,11 +1,20 @@
 """Authentication endpoints."""
 
+import hashlib
+import hmac
+import json
+import time
 from datetime import datetime
 from typing import Optional
+from urllib.parse import parse_qsl
+from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from stario_common.auth import (
     User,
@@ -16,15 +25,30 @@ from stario_common.auth import (
     verify_password,
     verify_token,
 )
+from stario_common.config import get_settings
+from stario_common.database import get_session
 from stario_common.logging import get_logger
 
-router = APIRouter()
+from ..routing import FastJSONRoute
+
+router = APIRouter(route_class=FastJSONRoute)
 logger = get_logger(__name__)
+settings = get_settings()
+
+# Key for checking Mini App init data, derived once from the bot token
+# https://core.telegram.org/bots/webapps#validating-data-received-via-the-mini-app
+TELEGRAM_SECRET = (
+    hmac.new(b"WebAppData", settings.telegram_bot_token.encode(), hashlib.sha256).digest()
+    if settings.telegram_bot_token
+    else None
+)
+# Signed init data older than this is refused, so a captured one cannot be replayed
+TELEGRAM_AUTH_MAX_AGE_SECONDS = 24 * 3600
 
 
 class RegisterRequest(BaseModel):
     email: EmailStr
-    password: str
+    password: str = Field(..., min_length=8)
     full_name: Optional[str] = None
     phone: Optional[str] = None
 
@@ -58,37 +82,68 @@ class TelegramAuthRequest(BaseModel):
     init_data: str  # Telegram WebApp init data
 
 
-# Mock user storage (replace with database in production)
-_users_db: dict[str, dict] = {}
+# Users are looked up by primary key or by the unique email index only
+CREATE_USER_SQL = text("""
+    INSERT INTO users (email, password_hash, full_name, phone)
+    VALUES (:email, :password_hash, :full_name, :phone)
+    ON CONFLICT (email) DO NOTHING
+    RETURNING id
+""")
+GET_USER_BY_EMAIL_SQL = text(
+    "SELECT id, email, password_hash, role FROM users WHERE email = :email AND deleted_at IS NULL"
+)
+GET_USER_BY_ID_SQL = text("""
+    SELECT id, email, full_name, role, is_verified, created_at
+    FROM users
+    WHERE id = :id AND deleted_at IS NULL
+""")
+# Telegram users are auto-verified; xmax is 0 only for a freshly inserted row
+UPSERT_TELEGRAM_USER_SQL = text("""
+    INSERT INTO users (email, full_name, telegram_id, telegram_username, is_verified)
+    VALUES (:email, :full_name, :telegram_id, :telegram_username, true)
+    ON CONFLICT (email) DO UPDATE
+    SET telegram_username = EXCLUDED.telegram_username, updated_at = NOW()
+    RETURNING id, email, role, (xmax = 0) AS inserted
+""")
+
+
+def parse_user_id(user_id: str) -> Optional[UUID]:
+    """Parse a user id from a token, or None if it is not a UUID."""
+    try:
+        return UUID(user_id)
+    except ValueError:
+        return None
 
 
 @router.post("/register", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
-async def register(request: RegisterRequest):
+async def register(
+    request: RegisterRequest,
+    session: AsyncSession = Depends(get_session),
+):
     """Register a new user."""
-    if request.email in _users_db:
+    result = await session.execute(
+        CREATE_USER_SQL,
+        {
+            "email": request.email,
+            "password_hash": await run_in_threadpool(hash_password, request.password),
+            "full_name": request.full_name,
+            "phone": request.phone,
+        }
+    )
+    row = result.fetchone()
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Email already registered",
         )
+    await session.commit()
 
-    import uuid
-    user_id = str(uuid.uuid4())
-
-    _users_db[request.email] = {
-        "id": user_id,
-        "email": request.email,
-        "password_hash": hash_password(request.password),
-        "full_name": request.full_name,
-        "phone": request.phone,
-        "role": "user",
-        "is_verified": False,
-        "created_at": datetime.utcnow(),
-    }
+    user_id = str(row.id)
 
     logger.info("user_registered", user_id=user_id, email=request.email)
 
     access_token = create_access_token(user_id=user_id, email=request.email)
-    refresh_token = create_refresh_token(user_id=user_id)
+    refresh_token = create_refresh_token(user_id=user_id, email=request.email)
 
     return TokenResponse(
         access_token=access_token,
@@ -98,23 +153,34 @@ async def register(request: RegisterRequest):
 
 
 @router.post("/login", response_model=TokenResponse)
-async def login(request: LoginRequest):
+async def login(
+    request: LoginRequest,
+    session: AsyncSession = Depends(get_session),
+):
     """Login with email and password."""
-    user = _users_db.get(request.email)
-    if not user or not verify_password(request.password, user["password_hash"]):
+    result = await session.execute(GET_USER_BY_EMAIL_SQL, {"email": request.email})
+    user = result.fetchone()
+    # Telegram-only accounts have no password to check against
+    if not user or not user.password_hash or not await run_in_threadpool(
+        verify_password, request.password, user.password_hash
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
         )
 
-    logger.info("user_logged_in", user_id=user["id"], email=request.email)
+    logger.info("user_logged_in", user_id=str(user.id), email=request.email)
 
     access_token = create_access_token(
-        user_id=user["id"],
-        email=user["email"],
-        role=user["role"],
+        user_id=str(user.id),
+        email=user.email,
+        role=user.role,
+    )
+    refresh_token = create_refresh_token(
+        user_id=str(user.id),
+        email=user.email,
+        role=user.role,
     )
-    refresh_token = create_refresh_token(user_id=user["id"])
 
     return TokenResponse(
         access_token=access_token,
@@ -124,10 +190,16 @@ async def login(request: LoginRequest):
 
 
 @router.post("/token", response_model=TokenResponse)
-async def login_form(form_data: OAuth2PasswordRequestForm = Depends()):
+async def login_form(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    session: AsyncSession = Depends(get_session),
+):
     """OAuth2 compatible login endpoint."""
-    user = _users_db.get(form_data.username)
-    if not user or not verify_password(form_data.password, user["password_hash"]):
+    result = await session.execute(GET_USER_BY_EMAIL_SQL, {"email": form_data.username})
+    user = result.fetchone()
+    if not user or not user.password_hash or not await run_in_threadpool(
+        verify_password, form_data.password, user.password_hash
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
@@ -135,11 +207,15 @@ async def login_form(form_data: OAuth2PasswordRequestForm = Depends()):
         )
 
     access_token = create_access_token(
-        user_id=user["id"],
-        email=user["email"],
-        role=user["role"],
+        user_id=str(user.id),
+        email=user.email,
+        role=user.role,
+    )
+    refresh_token = create_refresh_token(
+        user_id=str(user.id),
+        email=user.email,
+        role=user.role,
     )
-    refresh_token = create_refresh_token(user_id=user["id"])
 
     return TokenResponse(
         access_token=access_token,
@@ -149,7 +225,10 @@ async def login_form(form_data: OAuth2PasswordRequestForm = Depends()):
 
 
 @router.post("/refresh", response_model=TokenResponse)
-async def refresh_token(request: RefreshTokenRequest):
+async def refresh_token(
+    request: RefreshTokenRequest,
+    session: AsyncSession = Depends(get_session),
+):
     """Refresh access token using refresh token."""
     token_data = verify_token(request.refresh_token)
 
@@ -159,25 +238,31 @@ async def refresh_token(request: RefreshTokenRequest):
             detail="Invalid token type",
         )
 
-    # Find user
-    user = None
-    for u in _users_db.values():
-        if u["id"] == token_data.user_id:
-            user = u
-            break
-
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-        )
+    # Refresh tokens carry email and role, so no lookup is needed; older
+    # tokens without them still resolve the user from the database. Claims
+    # are never re-checked on this path, so the rotated token keeps the old
+    # expiry: a deleted or demoted account is cut off when it runs out
+    expires_at = None
+    if token_data.email:
+        user_id, email, role = token_data.user_id, token_data.email, token_data.role
+        expires_at = token_data.exp
+    else:
+        user = None
+        parsed_id = parse_user_id(token_data.user_id)
+        if parsed_id:
+            result = await session.execute(GET_USER_BY_ID_SQL, {"id": parsed_id})
+            user = result.fetchone()
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+            )
+        user_id, email, role = str(user.id), user.email, user.role
 
-    access_token = create_access_token(
-        user_id=user["id"],
-        email=user["email"],
-        role=user["role"],
+    access_token = create_access_token(user_id=user_id, email=email, role=role)
+    new_refresh_token = create_refresh_token(
+        user_id=user_id, email=email, role=role, expires_at=expires_at
     )
-    new_refresh_token = create_refresh_token(user_id=user["id"])
 
     return TokenResponse(
         access_token=access_token,
@@ -187,25 +272,44 @@ async def refresh_token(request: RefreshTokenRequest):
 
 
 @router.post("/telegram", response_model=TokenResponse)
-async def telegram_auth(request: TelegramAuthRequest):
+async def telegram_auth(
+    request: TelegramAuthRequest,
+    session: AsyncSession = Depends(get_session),
+):
     """Authenticate via Telegram Mini App."""
-    # Verify Telegram init data (implement proper validation in production)
-    # https://core.telegram.org/bots/webapps#validating-data-received-via-the-mini-app
-
-    import hashlib
-    import hmac
-    import json
-    from urllib.parse import parse_qs
+    fields = dict(parse_qsl(request.init_data, keep_blank_values=True))
 
-    from stario_common.config import get_settings
-
-    settings = get_settings()
+    # Without a bot token the signature cannot be checked; only allowed in debug
+    if TELEGRAM_SECRET is not None:
+        data_check_string = "\n".join(
+            f"{key}={value}" for key, value in sorted(fields.items()) if key != "hash"
+        )
+        expected_hash = hmac.new(
+            TELEGRAM_SECRET, data_check_string.encode(), hashlib.sha256
+        ).hexdigest()
+        if not hmac.compare_digest(expected_hash, fields.get("hash", "")):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid Telegram auth data",
+            )
+        auth_date = fields.get("auth_date", "")
+        if not auth_date.isdigit() or time.time() - int(auth_date) > TELEGRAM_AUTH_MAX_AGE_SECONDS:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Telegram auth data has expired",
+            )
+    elif not settings.debug:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Telegram auth is not configured",
+        )
 
-    # Parse init data
-    parsed = parse_qs(request.init_data)
-    user_data = json.loads(parsed.get("user", ["{}"])[0])
+    try:
+        user_data = json.loads(fields.get("user", "{}"))
+    except json.JSONDecodeError:
+        user_data = None
 
-    if not user_data:
+    if not user_data or not isinstance(user_data, dict):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid Telegram auth data",
@@ -217,33 +321,34 @@ async def telegram_auth(request: TelegramAuthRequest):
     last_name = user_data.get("last_name", "")
 
     # Create or get user
-    email = f"{telegram_id}@telegram.stario.uz"
-    if email not in _users_db:
-        import uuid
-        user_id = str(uuid.uuid4())
-        _users_db[email] = {
-            "id": user_id,
-            "email": email,
-            "password_hash": "",
+    result = await session.execute(
+        UPSERT_TELEGRAM_USER_SQL,
+        {
+            "email": f"{telegram_id}@telegram.stario.uz",
             "full_name": f"{first_name} {last_name}".strip(),
             "telegram_id": telegram_id,
             "telegram_username": username,
-            "role": "user",
-            "is_verified": True,  # Telegram users are auto-verified
-            "created_at": datetime.utcnow(),
         }
+    )
+    user = result.fetchone()
+    await session.commit()
+
+    user_id = str(user.id)
+    if user.inserted:
         logger.info("telegram_user_registered", user_id=user_id, telegram_id=telegram_id)
     else:
-        user_id = _users_db[email]["id"]
         logger.info("telegram_user_logged_in", user_id=user_id, telegram_id=telegram_id)
 
-    user = _users_db[email]
     access_token = create_access_token(
-        user_id=user["id"],
-        email=user["email"],
-        role=user["role"],
+        user_id=str(user.id),
+        email=user.email,
+        role=user.role,
+    )
+    refresh_token = create_refresh_token(
+        user_id=str(user.id),
+        email=user.email,
+        role=user.role,
     )
-    refresh_token = create_refresh_token(user_id=user["id"])
 
     return TokenResponse(
         access_token=access_token,
@@ -253,23 +358,29 @@ async def telegram_auth(request: TelegramAuthRequest):
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_me(user: User = Depends(get_current_user)):
+async def get_me(
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
     """Get current user profile."""
-    # Find full user data
-    for u in _users_db.values():
-        if u["id"] == user.id:
-            return UserResponse(
-                id=u["id"],
-                email=u["email"],
-                full_name=u.get("full_name"),
-                role=u["role"],
-                is_verified=u["is_verified"],
-                created_at=u["created_at"],
-            )
+    u = None
+    user_id = parse_user_id(user.id)
+    if user_id:
+        result = await session.execute(GET_USER_BY_ID_SQL, {"id": user_id})
+        u = result.fetchone()
+    if not u:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
 
-    raise HTTPException(
-        status_code=status.HTTP_404_NOT_FOUND,
-        detail="User not found",
+    return UserResponse(
+        id=str(u.id),
+        email=u.email,
+        full_name=u.full_name,
+        role=u.role,
+        is_verified=u.is_verified,
+        created_at=u.created_at,
     )
 
 
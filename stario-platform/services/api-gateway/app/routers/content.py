@@ -1,15 +1,26 @@
 """Content moderation and RegTech endpoints."""
 
-from datetime import datetime
-from typing import Optional
+import uuid
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import AsyncIterator, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from sqlalchemy import TextClause, text
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from stario_common.auth import User, get_current_user, require_role, Roles
+from stario_common.config import get_settings
+from stario_common.database import get_db, get_session
 from stario_common.logging import get_logger
+from stario_common.redis_client import get_redis
 
-router = APIRouter()
+from ..pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from ..routing import FastJSONResponse, FastJSONRoute, get_adapter
+
+router = APIRouter(route_class=FastJSONRoute)
 logger = get_logger(__name__)
 
 
@@ -67,6 +78,50 @@ class AuditLogEntry(BaseModel):
     ip_address: Optional[str]
 
 
+@lru_cache(maxsize=64)
+def audit_logs_sql(where_sql: str, seek: bool) -> TextClause:
+    """Page of audit logs, newest first, for one combination of filters.
+
+    With ``seek``, the page starts after (:cursor_ts, :cursor_id).
+    """
+    if seek:
+        where_sql += " AND (timestamp, id) < (:cursor_ts, :cursor_id)"
+    return text(f"""
+        SELECT id, timestamp, action, actor_id, resource_type, resource_id, details, ip_address
+        FROM audit_logs
+        WHERE {where_sql}
+        ORDER BY timestamp DESC, id DESC
+        LIMIT :limit OFFSET :offset
+    """)
+
+
+def audit_log_entry(row) -> AuditLogEntry:
+    """Build an AuditLogEntry from an audit_logs_sql() row."""
+    return AuditLogEntry(
+        id=str(row.id),
+        timestamp=row.timestamp,
+        action=row.action,
+        actor_id=row.actor_id,
+        resource_type=row.resource_type,
+        resource_id=row.resource_id,
+        details=row.details or {},
+        ip_address=str(row.ip_address) if row.ip_address else None,
+    )
+
+
+async def stream_audit_logs(query: TextClause, params: dict) -> AsyncIterator[bytes]:
+    """Yield audit log entries as NDJSON lines as the rows arrive.
+
+    Runs after the endpoint has returned, so it opens its own session
+    rather than borrowing the request's.
+    """
+    adapter = get_adapter(AuditLogEntry)
+    async with get_db().session() as session:
+        result = await session.stream(query, params)
+        async for row in result:
+            yield adapter.dump_json(audit_log_entry(row)) + b"\n"
+
+
 class LegalExportRequest(BaseModel):
     case_id: str
     date_from: datetime
@@ -102,8 +157,6 @@ async def moderate_content(
     - Hate speech
     - Copyright violations
     """
-    import uuid
-
     # Mock moderation result
     result = ModerationResult(
         content_id=request.content_id,
@@ -117,7 +170,7 @@ async def moderate_content(
             "toxicity": 0.03,
         },
         requires_human_review=False,
-        reviewed_at=datetime.utcnow(),
+        reviewed_at=datetime.now(timezone.utc),
         reviewer_id=None,
     )
 
@@ -148,7 +201,7 @@ async def get_moderation_queue(
             content_url="https://storage.stario.uz/review/vid_123.mp4",
             flags=["political"],
             priority=2,
-            submitted_at=datetime.utcnow(),
+            submitted_at=datetime.now(timezone.utc),
             artist_id="art_001",
         )
     ]
@@ -175,7 +228,7 @@ async def review_content(
         flags=[],
         confidence_scores={},
         requires_human_review=False,
-        reviewed_at=datetime.utcnow(),
+        reviewed_at=datetime.now(timezone.utc),
         reviewer_id=admin.id,
     )
 
@@ -214,27 +267,72 @@ async def get_audit_logs(
     action: Optional[str] = None,
     date_from: Optional[datetime] = None,
     date_to: Optional[datetime] = None,
-    page: int = 1,
-    page_size: int = 50,
+    q: Optional[str] = None,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="x-next-cursor of the previous page; overrides page"),
+    format: str = Query("json", pattern="^(json|ndjson)$"),
     admin: User = Depends(require_role([Roles.ADMIN])),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Get audit logs.
 
     Logs are retained for 90 days per compliance requirements.
+    ``q`` is a web-search style query (words, "phrases", -exclusions) over
+    each entry's action and details. A full page carries an
+    ``x-next-cursor`` header; pass it back as ``cursor`` to seek straight
+    to the next page, however deep.
+
+    ``format=ndjson`` streams the page one entry per line as the rows are
+    read, instead of building the whole array first. Its headers go out
+    before the last row is known, so it carries no ``x-next-cursor``.
     """
-    return [
-        AuditLogEntry(
-            id="log_001",
-            timestamp=datetime.utcnow(),
-            action="content.moderated",
-            actor_id="usr_001",
-            resource_type="video",
-            resource_id="vid_123",
-            details={"status": "approved"},
-            ip_address="192.168.1.1",
+    where_clauses = []
+    params = {"limit": page_size}
+    if cursor:
+        params["cursor_ts"], params["cursor_id"] = decode_cursor(cursor)
+        params["offset"] = 0
+    else:
+        params["offset"] = (page - 1) * page_size
+
+    if actor_id:
+        where_clauses.append("actor_id = :actor_id")
+        params["actor_id"] = actor_id
+    if resource_type:
+        where_clauses.append("resource_type = :resource_type")
+        params["resource_type"] = resource_type
+    if action:
+        where_clauses.append("action = :action")
+        params["action"] = action
+    if date_from:
+        where_clauses.append("timestamp >= :date_from")
+        params["date_from"] = date_from
+    if date_to:
+        where_clauses.append("timestamp <= :date_to")
+        params["date_to"] = date_to
+    if q:
+        # Matches the GIN index on the generated search_vector column
+        where_clauses.append("search_vector @@ websearch_to_tsquery('simple', :q)")
+        params["q"] = q
+
+    where_sql = " AND ".join(where_clauses) or "true"
+    query = audit_logs_sql(where_sql, seek=bool(cursor))
+    if format == "ndjson":
+        return StreamingResponse(
+            stream_audit_logs(query, params), media_type="application/x-ndjson"
         )
-    ]
+
+    result = await session.execute(query, params)
+    rows = result.fetchall()
+    entries = [audit_log_entry(row) for row in rows]
+
+    headers = {}
+    if len(rows) == page_size:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].timestamp, rows[-1].id)
+    return FastJSONResponse(
+        content=get_adapter(list[AuditLogEntry]).dump_json(entries), headers=headers
+    )
 
 
 # Legal compliance (Uzbekistan 2025-2030)
@@ -252,10 +350,24 @@ async def create_legal_export(
     - Content (videos, images, audio)
     - Audit logs
     - Transaction records
-    """
-    import uuid
 
+    The package is built by the RegTech service's export worker; poll
+    GET /legal-export/{export_id} for its status and download URL.
+    """
     export_id = str(uuid.uuid4())
+    created_at = datetime.now(timezone.utc)
+
+    # Queue the export under its own id so the status endpoint can find it
+    redis = await get_redis()
+    await redis.enqueue(
+        "legal_export",
+        {
+            **request.model_dump(mode="json"),
+            "requested_by": admin.id,
+            "created_at": created_at.isoformat(),
+        },
+        job_id=export_id,
+    )
 
     logger.info(
         "legal_export_initiated",
@@ -266,10 +378,10 @@ async def create_legal_export(
 
     return LegalExportResponse(
         export_id=export_id,
-        status="processing",
+        status="pending",
         download_url=None,
         record_count=0,
-        created_at=datetime.utcnow(),
+        created_at=created_at,
     )
 
 
@@ -279,12 +391,23 @@ async def get_legal_export_status(
     admin: User = Depends(require_role([Roles.ADMIN])),
 ):
     """Get status of legal export."""
+    redis = await get_redis()
+    job = await redis.get_job(export_id)
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Export not found",
+        )
+
+    # Set by the worker once the export completes or fails
+    result = job.get("result") or {}
     return LegalExportResponse(
         export_id=export_id,
-        status="completed",
-        download_url=f"https://storage.stario.uz/exports/{export_id}.zip",
-        record_count=150,
-        created_at=datetime.utcnow(),
+        status=job["status"],
+        download_url=result.get("download_url"),
+        record_count=result.get("record_count", 0),
+        created_at=job["data"]["created_at"],
     )
 
 
@@ -296,12 +419,24 @@ async def trigger_retention_cleanup(
     """
     Trigger data retention cleanup.
 
-    Removes data older than retention period (90 days for logs).
+    Removes data older than retention period (90 days for logs). The
+    deletion runs in the RegTech service's cleanup worker.
     """
+    settings = get_settings()
+    retention_days = settings.audit_log_retention_days
+
+    redis = await get_redis()
+    job_id = await redis.enqueue(
+        "retention_cleanup",
+        {"retention_days": retention_days, "requested_by": admin.id},
+    )
+
+    logger.info("retention_cleanup_queued", job_id=job_id, initiated_by=admin.id)
+
     return {
         "message": "Retention cleanup triggered",
-        "job_id": "cleanup_001",
-        "retention_days": 90,
+        "job_id": job_id,
+        "retention_days": retention_days,
     }
 
 
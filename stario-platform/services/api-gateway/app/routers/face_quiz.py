@@ -1,18 +1,76 @@
 """Face Quiz and Face Similarity endpoints."""
 
-from datetime import datetime
+import heapq
+import random
+import uuid
+from datetime import datetime, timezone
 from typing import Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
-from pydantic import BaseModel
+import httpx
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from pydantic import BaseModel, Field
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from stario_common.auth import User, get_current_user, get_current_user_optional
 from stario_common.config import get_settings
+from stario_common.database import get_session
 from stario_common.logging import get_logger
+from stario_common.redis_client import get_redis
 from stario_common.s3_client import get_s3
 
-router = APIRouter()
+from ..routing import FastJSONRoute
+from .auth import parse_user_id
+
+router = APIRouter(route_class=FastJSONRoute)
 logger = get_logger(__name__)
+settings = get_settings()
+
+# Pooled client for the face-similarity (InsightFace) service, shared by all
+# requests so analyses reuse keep-alive connections. The timeout keeps a
+# slow backend inside the 200ms target instead of holding the request
+face_service = httpx.AsyncClient(
+    base_url=settings.insightface_endpoint,
+    timeout=0.5,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+)
+
+# Scores for AI_MODE=mock; a private generator rather than the shared one
+mock_random = random.Random()
+
+# Leaderboard period -> (key suffix format, TTL in seconds). Each completed
+# quiz lands on the current bucket of every period, so a leaderboard read is
+# a single ZREVRANGE; past buckets expire once their period is over
+LEADERBOARD_PERIODS: dict[str, tuple[str, Optional[int]]] = {
+    "daily": ("%Y%m%d", 2 * 86400),
+    "weekly": ("%G-W%V", 8 * 86400),
+    "monthly": ("%Y%m", 32 * 86400),
+    "all_time": ("", None),
+}
+
+LEADERBOARD_USERS_SQL = text("""
+    SELECT id, full_name, telegram_username, avatar_url
+    FROM users
+    WHERE id = ANY(:ids)
+""")
+
+
+def badge_for(similarity_score: float) -> Optional[str]:
+    """Badge earned for a similarity score, if any."""
+    if similarity_score >= 80:
+        return "Twin"
+    if similarity_score >= 70:
+        return "Lookalike"
+    if similarity_score >= 60:
+        return "Similar"
+    return None
+
+
+def leaderboard_key(artist_id: str, period: str, now: datetime) -> str:
+    """Redis sorted set holding an artist's leaderboard for the current period."""
+    suffix_format, _ = LEADERBOARD_PERIODS[period]
+    key = f"face_quiz:leaderboard:{artist_id}:{period}"
+    return f"{key}:{now.strftime(suffix_format)}" if suffix_format else key
 
 
 class FaceQuizRequest(BaseModel):
@@ -37,6 +95,11 @@ class FaceSimilarityResult(BaseModel):
     share_image_url: str
 
 
+class FaceBatchAnalyzeRequest(BaseModel):
+    artist_ids: list[str] = Field(..., min_length=1, max_length=500)
+    top_k: int = Field(10, ge=1, le=100)
+
+
 class FaceQuizLeaderboardEntry(BaseModel):
     rank: int
     user_id: str
@@ -56,9 +119,6 @@ async def start_face_quiz(
     Returns a presigned URL for direct photo upload.
     Photo is processed ephemerally (deleted after 3s) unless user opts in.
     """
-    import uuid
-
-    settings = get_settings()
     s3 = get_s3()
 
     quiz_id = str(uuid.uuid4())
@@ -88,6 +148,20 @@ async def start_face_quiz(
     )
 
 
+def similarity_result(quiz_id: str, analysis: dict) -> FaceSimilarityResult:
+    """Build the result for one artist from the face service's analysis."""
+    similarity_score = analysis["similarity_score"]
+    return FaceSimilarityResult(
+        quiz_id=quiz_id,
+        artist_id=analysis["artist_id"],
+        similarity_score=round(similarity_score, 1),
+        matching_features=analysis["matching_features"],
+        rank_percentile=round(analysis["rank_percentile"], 1),
+        badge_earned=badge_for(similarity_score),
+        share_image_url=f"https://storage.stario.uz/share/{quiz_id}.jpg",
+    )
+
+
 @router.post("/{quiz_id}/analyze", response_model=FaceSimilarityResult)
 async def analyze_face(
     quiz_id: str,
@@ -98,34 +172,39 @@ async def analyze_face(
 
     Processing target: <200ms per requirements.
     """
-    import asyncio
-    import random
-
-    # Simulate AI processing (mock)
-    # In production, call face-similarity service
-    await asyncio.sleep(0.15)  # Mock ~150ms latency
-
-    # Generate mock results
-    similarity_score = random.uniform(45, 85)
-
-    # Determine badge
-    if similarity_score >= 80:
-        badge = "Twin"
-    elif similarity_score >= 70:
-        badge = "Lookalike"
-    elif similarity_score >= 60:
-        badge = "Similar"
+    if settings.ai_mode == "mock":
+        analysis = {
+            "artist_id": "art_001",
+            "similarity_score": mock_random.uniform(45, 85),
+            "matching_features": ["eyes", "face_shape"],
+            "rank_percentile": mock_random.uniform(60, 95),
+        }
     else:
-        badge = None
-
-    result = FaceSimilarityResult(
-        quiz_id=quiz_id,
-        artist_id="art_001",
-        similarity_score=round(similarity_score, 1),
-        matching_features=["eyes", "face_shape"],
-        rank_percentile=round(random.uniform(60, 95), 1),
-        badge_earned=badge,
-        share_image_url=f"https://storage.stario.uz/share/{quiz_id}.jpg",
+        try:
+            response = await face_service.post(
+                f"/analyze/{quiz_id}",
+                json={"upload_key": f"face-quiz/{quiz_id}/photo.jpg"},
+            )
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.error("face_analysis_failed", quiz_id=quiz_id, error=str(e))
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail="Face analysis is unavailable",
+            )
+        analysis = response.json()
+
+    result = similarity_result(quiz_id, analysis)
+
+    now = datetime.now(timezone.utc)
+    redis = await get_redis()
+    await redis.leaderboard_add(
+        {
+            leaderboard_key(result.artist_id, period, now): ttl_seconds
+            for period, (_, ttl_seconds) in LEADERBOARD_PERIODS.items()
+        },
+        user.id,
+        result.similarity_score,
     )
 
     logger.info(
@@ -138,36 +217,102 @@ async def analyze_face(
     return result
 
 
+@router.post("/{quiz_id}/batch-analyze", response_model=list[FaceSimilarityResult])
+async def batch_analyze_face(
+    quiz_id: str,
+    request: FaceBatchAnalyzeRequest,
+    user: User = Depends(get_current_user),
+):
+    """
+    Compare the uploaded photo with many artists at once.
+
+    The face service scores every candidate in one call (a single matrix
+    product over the artist embeddings), so the request stays within the
+    200ms target however many artists are compared. Returns the ``top_k``
+    best matches, best first.
+    """
+    if settings.ai_mode == "mock":
+        analyses = [
+            {
+                "artist_id": artist_id,
+                "similarity_score": mock_random.uniform(45, 85),
+                "matching_features": ["eyes", "face_shape"],
+                "rank_percentile": mock_random.uniform(60, 95),
+            }
+            for artist_id in request.artist_ids
+        ]
+    else:
+        try:
+            response = await face_service.post(
+                f"/analyze/{quiz_id}/batch",
+                json={
+                    "upload_key": f"face-quiz/{quiz_id}/photo.jpg",
+                    "artist_ids": request.artist_ids,
+                    "top_k": request.top_k,
+                },
+            )
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.error("face_batch_analysis_failed", quiz_id=quiz_id, error=str(e))
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail="Face analysis is unavailable",
+            )
+        analyses = response.json()["results"]
+
+    # Partial selection rather than a full sort of every candidate
+    best = heapq.nlargest(request.top_k, analyses, key=lambda analysis: analysis["similarity_score"])
+
+    logger.info(
+        "face_quiz_batch_completed",
+        quiz_id=quiz_id,
+        user_id=user.id,
+        candidates=len(request.artist_ids),
+    )
+
+    return [similarity_result(quiz_id, analysis) for analysis in best]
+
+
 @router.get("/leaderboard", response_model=list[FaceQuizLeaderboardEntry])
 async def get_face_quiz_leaderboard(
     artist_id: str,
-    period: str = "weekly",  # daily, weekly, monthly, all_time
-    limit: int = 10,
+    period: str = Query("weekly", pattern="^(daily|weekly|monthly|all_time)$"),
+    limit: int = Query(10, ge=1, le=100),
+    session: AsyncSession = Depends(get_session),
 ):
-    """Get Face Quiz leaderboard for an artist."""
-    return [
-        FaceQuizLeaderboardEntry(
-            rank=1,
-            user_id="usr_001",
-            username="facemaster",
-            similarity_score=89.5,
-            avatar_url="https://storage.stario.uz/avatars/usr_001.jpg",
-        ),
-        FaceQuizLeaderboardEntry(
-            rank=2,
-            user_id="usr_002",
-            username="twinseeker",
-            similarity_score=87.2,
-            avatar_url=None,
-        ),
-        FaceQuizLeaderboardEntry(
-            rank=3,
-            user_id="usr_003",
-            username="lookalike",
-            similarity_score=85.8,
-            avatar_url="https://storage.stario.uz/avatars/usr_003.jpg",
-        ),
-    ]
+    """Get Face Quiz leaderboard for an artist.
+
+    Ranks come from the sorted set analyze_face() maintains; only the
+    profiles of the ranked users are read from the database.
+    """
+    redis = await get_redis()
+    top = await redis.leaderboard_top(
+        leaderboard_key(artist_id, period, datetime.now(timezone.utc)), limit
+    )
+    if not top:
+        return []
+
+    # Members are token subjects; one that is not a UUID has no profile and
+    # must not reach the uuid column, or it would break the whole board
+    user_ids = [user_id for user_id, _ in top if parse_user_id(user_id)]
+    profiles = {}
+    if user_ids:
+        result = await session.execute(LEADERBOARD_USERS_SQL, {"ids": user_ids})
+        profiles = {str(row.id): row for row in result}
+
+    entries = []
+    for rank, (user_id, score) in enumerate(top, start=1):
+        profile = profiles.get(user_id)
+        entries.append(
+            FaceQuizLeaderboardEntry(
+                rank=rank,
+                user_id=user_id,
+                username=(profile and (profile.telegram_username or profile.full_name)) or "anonymous",
+                similarity_score=score,
+                avatar_url=profile.avatar_url if profile else None,
+            )
+        )
+    return entries
 
 
 @router.get("/my-results", response_model=list[FaceSimilarityResult])
@@ -212,7 +357,6 @@ async def delete_quiz_photo(
     user: User = Depends(get_current_user),
 ):
     """Manually delete Face Quiz photo (PII compliance)."""
-    settings = get_settings()
     s3 = get_s3()
 
     upload_key = f"face-quiz/{quiz_id}/photo.jpg"
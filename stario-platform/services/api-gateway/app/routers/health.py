@@ -1,15 +1,32 @@
 """Health check endpoints."""
 
+import asyncio
+import time
 from datetime import datetime
-from typing import Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter
 from pydantic import BaseModel
+from sqlalchemy import text
 
 from stario_common.database import get_db
 from stario_common.redis_client import get_redis
 
-router = APIRouter()
+from ..routing import FastJSONRoute
+
+router = APIRouter(route_class=FastJSONRoute)
+
+# Each dependency gets this long to answer before it is reported down
+READINESS_TIMEOUT_SECONDS = 0.5
+PING_SQL = text("SELECT 1")
+
+# Dependencies are probed in the background on this interval, however often
+# the orchestrator asks; /ready only reads the last result
+READINESS_REFRESH_SECONDS = 5
+# A result older than this means the refresher (or the event loop) is stuck
+READINESS_STALE_SECONDS = 15
+
+# Last probe results and when they were taken (monotonic clock)
+readiness_state: dict = {"checks": {"database": False, "redis": False}, "checked_at": None}
 
 
 class HealthResponse(BaseModel):
@@ -38,29 +55,48 @@ async def health_check():
     )
 
 
-@router.get("/ready", response_model=ReadinessResponse)
-async def readiness_check():
-    """Readiness check - verifies all dependencies are available."""
-    checks = {}
+async def ping_database() -> None:
+    """Run a trivial query on a pooled connection."""
+    async with get_db().engine.connect() as conn:
+        await conn.scalar(PING_SQL)
 
-    # Check database
-    try:
-        db = get_db()
-        async with db.session() as session:
-            await session.execute("SELECT 1")
-        checks["database"] = True
-    except Exception:
-        checks["database"] = False
 
-    # Check Redis
+async def ping_redis() -> None:
+    """Ping the main Redis connection."""
+    redis = await get_redis()
+    await redis.client.ping()
+
+
+async def probe(ping) -> bool:
+    """Whether a ping completes within the readiness timeout."""
     try:
-        redis = await get_redis()
-        await redis.client.ping()
-        checks["redis"] = True
+        await asyncio.wait_for(ping, timeout=READINESS_TIMEOUT_SECONDS)
+        return True
     except Exception:
-        checks["redis"] = False
+        return False
+
+
+async def refresh_readiness() -> None:
+    """Probe the dependencies every READINESS_REFRESH_SECONDS. Runs for the app's lifetime."""
+    while True:
+        # Both are probed at once, so a hung Redis cannot delay the database result
+        database, redis = await asyncio.gather(
+            probe(ping_database()),
+            probe(ping_redis()),
+        )
+        readiness_state["checks"] = {"database": database, "redis": redis}
+        readiness_state["checked_at"] = time.monotonic()
+        await asyncio.sleep(READINESS_REFRESH_SECONDS)
+
+
+@router.get("/ready", response_model=ReadinessResponse)
+async def readiness_check():
+    """Readiness check - reports the background probe of all dependencies."""
+    checks = readiness_state["checks"]
+    checked_at = readiness_state["checked_at"]
+    fresh = checked_at is not None and time.monotonic() - checked_at <= READINESS_STALE_SECONDS
 
-    ready = all(checks.values())
+    ready = fresh and all(checks.values())
     return ReadinessResponse(ready=ready, checks=checks)
 
 
@@ -1,6 +1,7 @@
 """Merchandise (MerchVerse) endpoints."""
 
-from datetime import datetime
+import uuid
+from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Optional
 
@@ -8,8 +9,12 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
 
 from stario_common.auth import User, get_current_user, require_role, Roles
+from stario_common.redis_client import get_redis
 
-router = APIRouter()
+from ..local_cache import invalidate, local_cached
+from ..routing import FastJSONResponse, FastJSONRoute, get_adapter
+
+router = APIRouter(route_class=FastJSONRoute)
 
 
 class ProductCategory(BaseModel):
@@ -101,41 +106,83 @@ class STLGenerationResponse(BaseModel):
     estimated_duration_seconds: int
 
 
+# The catalog is fixed, so its responses are validated and encoded once at
+# import and sent as-is
+PRODUCT_CATEGORIES = [
+    ProductCategory(
+        id="cat_001",
+        name="T-Shirts",
+        description="Custom printed t-shirts",
+        icon_url="https://storage.stario.uz/icons/tshirt.svg",
+    ),
+    ProductCategory(
+        id="cat_002",
+        name="Posters & Prints",
+        description="High-quality art prints",
+        icon_url="https://storage.stario.uz/icons/poster.svg",
+    ),
+    ProductCategory(
+        id="cat_003",
+        name="Phone Cases",
+        description="Personalized phone cases",
+        icon_url="https://storage.stario.uz/icons/phone.svg",
+    ),
+    ProductCategory(
+        id="cat_004",
+        name="Mugs",
+        description="Custom printed mugs",
+        icon_url="https://storage.stario.uz/icons/mug.svg",
+    ),
+    ProductCategory(
+        id="cat_005",
+        name="3D Figurines",
+        description="AI-generated 3D collectibles",
+        icon_url="https://storage.stario.uz/icons/figurine.svg",
+    ),
+]
+PRODUCT_CATEGORIES_JSON = get_adapter(list[ProductCategory]).dump_json(PRODUCT_CATEGORIES)
+
+PRODUCTS = [
+    Product(
+        id="prod_001",
+        name="Artist T-Shirt",
+        description="Premium cotton t-shirt with artist design",
+        category_id="cat_001",
+        artist_id="art_001",
+        base_price_uzs=150000,
+        images=[
+            "https://storage.stario.uz/products/tshirt_001_front.jpg",
+            "https://storage.stario.uz/products/tshirt_001_back.jpg",
+        ],
+        customization_options=[
+            {"type": "size", "options": ["S", "M", "L", "XL", "XXL"]},
+            {"type": "color", "options": ["black", "white", "navy"]},
+        ],
+        is_available=True,
+        is_premium=False,
+    ),
+    Product(
+        id="prod_002",
+        name="Limited Edition Figurine",
+        description="AI-generated 3D printed collectible",
+        category_id="cat_005",
+        artist_id="art_001",
+        base_price_uzs=500000,
+        images=[
+            "https://storage.stario.uz/products/figurine_001.jpg",
+        ],
+        customization_options=[],
+        is_available=True,
+        is_premium=True,
+    ),
+]
+PRODUCTS_JSON = get_adapter(list[Product]).dump_json(PRODUCTS)
+
+
 @router.get("/categories", response_model=list[ProductCategory])
 async def list_categories():
     """List merchandise categories."""
-    return [
-        ProductCategory(
-            id="cat_001",
-            name="T-Shirts",
-            description="Custom printed t-shirts",
-            icon_url="https://storage.stario.uz/icons/tshirt.svg",
-        ),
-        ProductCategory(
-            id="cat_002",
-            name="Posters & Prints",
-            description="High-quality art prints",
-            icon_url="https://storage.stario.uz/icons/poster.svg",
-        ),
-        ProductCategory(
-            id="cat_003",
-            name="Phone Cases",
-            description="Personalized phone cases",
-            icon_url="https://storage.stario.uz/icons/phone.svg",
-        ),
-        ProductCategory(
-            id="cat_004",
-            name="Mugs",
-            description="Custom printed mugs",
-            icon_url="https://storage.stario.uz/icons/mug.svg",
-        ),
-        ProductCategory(
-            id="cat_005",
-            name="3D Figurines",
-            description="AI-generated 3D collectibles",
-            icon_url="https://storage.stario.uz/icons/figurine.svg",
-        ),
-    ]
+    return FastJSONResponse(PRODUCT_CATEGORIES_JSON)
 
 
 @router.get("/products", response_model=list[Product])
@@ -147,40 +194,7 @@ async def list_products(
     page_size: int = 20,
 ):
     """List available products."""
-    return [
-        Product(
-            id="prod_001",
-            name="Artist T-Shirt",
-            description="Premium cotton t-shirt with artist design",
-            category_id="cat_001",
-            artist_id="art_001",
-            base_price_uzs=150000,
-            images=[
-                "https://storage.stario.uz/products/tshirt_001_front.jpg",
-                "https://storage.stario.uz/products/tshirt_001_back.jpg",
-            ],
-            customization_options=[
-                {"type": "size", "options": ["S", "M", "L", "XL", "XXL"]},
-                {"type": "color", "options": ["black", "white", "navy"]},
-            ],
-            is_available=True,
-            is_premium=False,
-        ),
-        Product(
-            id="prod_002",
-            name="Limited Edition Figurine",
-            description="AI-generated 3D printed collectible",
-            category_id="cat_005",
-            artist_id="art_001",
-            base_price_uzs=500000,
-            images=[
-                "https://storage.stario.uz/products/figurine_001.jpg",
-            ],
-            customization_options=[],
-            is_available=True,
-            is_premium=True,
-        ),
-    ]
+    return FastJSONResponse(PRODUCTS_JSON)
 
 
 @router.get("/products/{product_id}", response_model=Product)
@@ -211,8 +225,6 @@ async def generate_preview(
     user: User = Depends(get_current_user),
 ):
     """Generate preview of customized product."""
-    import uuid
-
     return CustomizationPreview(
         preview_id=str(uuid.uuid4()),
         preview_url="https://storage.stario.uz/previews/preview_001.jpg",
@@ -232,8 +244,6 @@ async def generate_stl(
 
     Uses AI to create 3D model placeholders for print-on-demand.
     """
-    import uuid
-
     job_id = str(uuid.uuid4())
 
     return STLGenerationResponse(
@@ -283,8 +293,6 @@ async def checkout(
 
     Returns payment options and order ID.
     """
-    import uuid
-
     order_id = str(uuid.uuid4())
 
     return {
@@ -325,32 +333,43 @@ async def get_order(
         total_uzs=165000,
         shipping_address={},
         tracking_number=None,
-        created_at=datetime.utcnow(),
+        created_at=datetime.now(timezone.utc),
         estimated_delivery=None,
     )
 
 
+# Pricing configuration, kept in Redis (no expiry) once an admin saves one
+PRICING_CACHE_KEY = "merch:pricing:v1"
+DEFAULT_PRICING = {
+    "artist_share_percent": 50,
+    "platform_share_percent": 50,
+    "production_costs": {
+        "tshirt": 50000,
+        "mug": 30000,
+        "poster_a4": 15000,
+        "figurine": 200000,
+    },
+    "shipping_zones": {
+        "tashkent": 15000,
+        "regional": 25000,
+        "international": 100000,
+    },
+}
+
+
+async def load_pricing() -> dict:
+    """Current pricing configuration, or the defaults if none was saved."""
+    redis = await get_redis()
+    return await redis.cache_get(PRICING_CACHE_KEY) or DEFAULT_PRICING
+
+
 # Admin endpoints
 @router.get("/admin/pricing")
 async def get_pricing_config(
     admin: User = Depends(require_role([Roles.ADMIN])),
 ):
     """Get pricing configuration."""
-    return {
-        "artist_share_percent": 50,
-        "platform_share_percent": 50,
-        "production_costs": {
-            "tshirt": 50000,
-            "mug": 30000,
-            "poster_a4": 15000,
-            "figurine": 200000,
-        },
-        "shipping_zones": {
-            "tashkent": 15000,
-            "regional": 25000,
-            "international": 100000,
-        },
-    }
+    return await local_cached(PRICING_CACHE_KEY, load_pricing)
 
 
 @router.put("/admin/pricing")
@@ -359,4 +378,7 @@ async def update_pricing_config(
     admin: User = Depends(require_role([Roles.ADMIN])),
 ):
     """Update pricing configuration."""
+    redis = await get_redis()
+    await redis.cache_set(PRICING_CACHE_KEY, pricing, ttl_seconds=None)
+    await invalidate(PRICING_CACHE_KEY)
     return {"message": "Pricing updated", "pricing": pricing}
@@ -1,15 +1,26 @@
 """Order management endpoints."""
 
+import uuid
+from collections import defaultdict
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from pydantic import BaseModel
+from sqlalchemy import TextClause, text
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from stario_common.auth import User, get_current_user, require_role, Roles
+from stario_common.database import get_session
 from stario_common.models import OrderStatus
 
-router = APIRouter()
+from ..pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from ..routing import FastJSONResponse, FastJSONRoute, get_adapter
+from .auth import parse_user_id
+
+router = APIRouter(route_class=FastJSONRoute)
 
 
 class OrderItem(BaseModel):
@@ -51,14 +62,110 @@ class OrderSummary(BaseModel):
     completed_orders: int
 
 
+ORDER_COLUMNS = """id, user_id, status, subtotal_uzs, discount_uzs, shipping_uzs, total_uzs,
+    payment_provider, payment_id, shipping_address, created_at, updated_at, completed_at"""
+
+# Items for a whole page of orders, fetched in one query
+ORDER_ITEMS_SQL = text("""
+    SELECT id, order_id, product_type, product_id, artist_id, quantity, unit_price_uzs, customization
+    FROM order_items
+    WHERE order_id = ANY(:order_ids)
+    ORDER BY created_at
+""")
+
+
+@lru_cache(maxsize=64)
+def list_orders_sql(where_sql: str, seek: bool) -> TextClause:
+    """Page of orders, newest first, for one combination of filters.
+
+    With ``seek``, the page starts after (:cursor_ts, :cursor_id).
+    """
+    if seek:
+        where_sql += " AND (created_at, id) < (:cursor_ts, :cursor_id)"
+    return text(f"""
+        SELECT {ORDER_COLUMNS} FROM orders
+        WHERE {where_sql}
+        ORDER BY created_at DESC, id DESC
+        LIMIT :limit OFFSET :offset
+    """)
+
+
+async def fetch_orders(
+    session: AsyncSession,
+    where_sql: str,
+    params: dict,
+    page: int,
+    page_size: int,
+    cursor: Optional[str],
+) -> Response:
+    """Load a page of orders and their items in two queries, not one per order.
+
+    A full page carries an ``x-next-cursor`` header; passed back as
+    ``cursor``, it seeks straight to the next page instead of using OFFSET.
+    """
+    params["limit"] = page_size
+    if cursor:
+        params["cursor_ts"], params["cursor_id"] = decode_cursor(cursor)
+        params["offset"] = 0
+    else:
+        params["offset"] = (page - 1) * page_size
+
+    result = await session.execute(list_orders_sql(where_sql, seek=bool(cursor)), params)
+    orders = result.fetchall()
+    if not orders:
+        return FastJSONResponse(content=b"[]")
+
+    result = await session.execute(
+        ORDER_ITEMS_SQL, {"order_ids": [order.id for order in orders]}
+    )
+    items_by_order = defaultdict(list)
+    for item in result:
+        items_by_order[item.order_id].append(
+            OrderItem(
+                id=str(item.id),
+                product_type=item.product_type,
+                product_id=str(item.product_id) if item.product_id else "",
+                artist_id=str(item.artist_id) if item.artist_id else "",
+                quantity=item.quantity,
+                unit_price_uzs=item.unit_price_uzs,
+                customization=item.customization,
+            )
+        )
+
+    page_orders = [
+        Order(
+            id=str(order.id),
+            user_id=str(order.user_id),
+            items=items_by_order[order.id],
+            status=order.status,
+            subtotal_uzs=order.subtotal_uzs,
+            discount_uzs=order.discount_uzs or 0,
+            shipping_uzs=order.shipping_uzs or 0,
+            total_uzs=order.total_uzs,
+            payment_provider=order.payment_provider,
+            payment_id=order.payment_id,
+            shipping_address=order.shipping_address,
+            created_at=order.created_at,
+            updated_at=order.updated_at,
+            completed_at=order.completed_at,
+        )
+        for order in orders
+    ]
+
+    headers = {}
+    if len(orders) == page_size:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(orders[-1].created_at, orders[-1].id)
+    return FastJSONResponse(
+        content=get_adapter(list[Order]).dump_json(page_orders), headers=headers
+    )
+
+
 @router.post("", response_model=Order, status_code=status.HTTP_201_CREATED)
 async def create_order(
     request: CreateOrderRequest,
     user: User = Depends(get_current_user),
 ):
     """Create a new order."""
-    import uuid
-
     order_id = str(uuid.uuid4())
 
     # Calculate totals
@@ -103,12 +210,28 @@ async def create_order(
 @router.get("", response_model=list[Order])
 async def list_orders(
     status_filter: Optional[str] = None,
-    page: int = 1,
-    page_size: int = 20,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="x-next-cursor of the previous page; overrides page"),
     user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
 ):
     """List user's orders."""
-    return []
+    # A subject that is not a UUID cannot own orders
+    user_id = parse_user_id(user.id)
+    if not user_id:
+        return FastJSONResponse(content=b"[]")
+
+    where_clauses = ["user_id = :user_id"]
+    params = {"user_id": user_id}
+
+    if status_filter:
+        where_clauses.append("status = :status")
+        params["status"] = status_filter
+
+    return await fetch_orders(
+        session, " AND ".join(where_clauses), params, page, page_size, cursor
+    )
 
 
 @router.get("/{order_id}", response_model=Order)
@@ -169,16 +292,41 @@ async def update_shipping(
 @router.get("/admin/all", response_model=list[Order])
 async def list_all_orders(
     status_filter: Optional[str] = None,
-    user_id: Optional[str] = None,
-    artist_id: Optional[str] = None,
+    user_id: Optional[UUID] = None,
+    artist_id: Optional[UUID] = None,
     date_from: Optional[datetime] = None,
     date_to: Optional[datetime] = None,
-    page: int = 1,
-    page_size: int = 50,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="x-next-cursor of the previous page; overrides page"),
     admin: User = Depends(require_role([Roles.ADMIN, Roles.OPERATOR])),
+    session: AsyncSession = Depends(get_session),
 ):
     """List all orders (admin)."""
-    return []
+    where_clauses = []
+    params = {}
+
+    if status_filter:
+        where_clauses.append("status = :status")
+        params["status"] = status_filter
+    if user_id:
+        where_clauses.append("user_id = :user_id")
+        params["user_id"] = user_id
+    if artist_id:
+        where_clauses.append(
+            "EXISTS (SELECT 1 FROM order_items WHERE order_id = orders.id AND artist_id = :artist_id)"
+        )
+        params["artist_id"] = artist_id
+    if date_from:
+        where_clauses.append("created_at >= :date_from")
+        params["date_from"] = date_from
+    if date_to:
+        where_clauses.append("created_at <= :date_to")
+        params["date_to"] = date_to
+
+    return await fetch_orders(
+        session, " AND ".join(where_clauses) or "true", params, page, page_size, cursor
+    )
 
 
 @router.get("/admin/summary", response_model=OrderSummary)
@@ -1,5 +1,6 @@
 """Payment processing endpoints - Stripe, Payme, Click, VAS."""
 
+import uuid
 from datetime import datetime
 from typing import Optional
 
@@ -11,7 +12,9 @@ from stario_common.config import get_settings
 from stario_common.logging import get_logger
 from stario_common.models import PaymentStatus
 
-router = APIRouter()
+from ..routing import FastJSONRoute
+
+router = APIRouter(route_class=FastJSONRoute)
 logger = get_logger(__name__)
 
 
@@ -78,8 +81,6 @@ async def init_payment(
     user: User = Depends(get_current_user),
 ):
     """Initialize payment for an order."""
-    import uuid
-
     settings = get_settings()
     payment_id = str(uuid.uuid4())
 
@@ -294,8 +295,6 @@ async def create_refund(
     admin: User = Depends(require_role([Roles.ADMIN])),
 ):
     """Process refund for a payment."""
-    import uuid
-
     logger.info(
         "refund_initiated",
         payment_id=request.payment_id,
@@ -1,5 +1,6 @@
 """Poster generation endpoints - Poster Maker."""
 
+import uuid
 from datetime import datetime
 from typing import Optional
 
@@ -10,7 +11,9 @@ from stario_common.auth import User, get_current_user
 from stario_common.models import JobStatus
 from stario_common.redis_client import get_redis
 
-router = APIRouter()
+from ..routing import FastJSONRoute
+
+router = APIRouter(route_class=FastJSONRoute)
 
 
 class PosterTemplate(BaseModel):
@@ -106,8 +109,6 @@ async def generate_poster(
     Target generation time: ≤5 seconds per requirements.
     Uses SDXL (fine-tuned) for high-quality poster generation.
     """
-    import uuid
-
     job_id = str(uuid.uuid4())
 
     redis = await get_redis()
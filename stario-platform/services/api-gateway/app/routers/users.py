@@ -9,7 +9,9 @@ from pydantic import BaseModel, EmailStr
 
 from stario_common.auth import User, get_current_user, require_role, Roles
 
-router = APIRouter()
+from ..routing import FastJSONRoute
+
+router = APIRouter(route_class=FastJSONRoute)
 
 
 class UserProfile(BaseModel):
@@ -1,5 +1,6 @@
 """Video generation endpoints - Stario Moment."""
 
+import uuid
 from datetime import datetime
 from typing import Optional
 from uuid import UUID
@@ -13,7 +14,9 @@ from stario_common.logging import get_logger
 from stario_common.models import JobStatus
 from stario_common.redis_client import get_redis
 
-router = APIRouter()
+from ..routing import FastJSONRoute
+
+router = APIRouter(route_class=FastJSONRoute)
 logger = get_logger(__name__)
 
 
@@ -70,8 +73,6 @@ async def generate_video(
     This creates a "Stario Moment" - an AI-generated video greeting
     from an artist to the recipient.
     """
-    import uuid
-
     job_id = str(uuid.uuid4())
     settings = get_settings()
 
@@ -1,5 +1,6 @@
 """Voice generation and Voice Quiz endpoints."""
 
+import uuid
 from datetime import datetime
 from typing import Optional
 
@@ -10,7 +11,9 @@ from stario_common.auth import User, get_current_user
 from stario_common.models import JobStatus
 from stario_common.redis_client import get_redis
 
-router = APIRouter()
+from ..routing import FastJSONRoute
+
+router = APIRouter(route_class=FastJSONRoute)
 
 
 class VoiceGenerationRequest(BaseModel):
@@ -71,8 +74,6 @@ async def generate_voice(
 
     Uses RVC/FastSpeech2 for voice synthesis.
     """
-    import uuid
-
     job_id = str(uuid.uuid4())
 
     redis = await get_redis()
@@ -132,8 +133,6 @@ async def start_voice_quiz(
     The quiz presents audio samples and user must identify
     the real artist voice vs AI-generated voices.
     """
-    import uuid
-
     quiz_id = str(uuid.uuid4())
 
     return VoiceQuizResponse(
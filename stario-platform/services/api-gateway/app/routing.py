@@ -0,0 +1,100 @@
+"""
+Route class that serializes response models straight to JSON bytes.
+"""
+
+import inspect
+from decimal import Decimal
+from functools import lru_cache, wraps
+from typing import Any, Callable
+
+import orjson
+from fastapi import Response
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+
+
+# Aware datetimes end in "Z", matching pydantic's output for the same models
+ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+def orjson_default(value: Any) -> str:
+    """Fallback for the one type orjson cannot encode natively.
+
+    Decimals are rendered as strings, like pydantic does. Anything else is
+    a bug in the caller and is left to fail.
+    """
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def orjson_dumps(content: Any) -> bytes:
+    """Encode a plain payload with the gateway's orjson settings."""
+    return orjson.dumps(content, default=orjson_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(Response):
+    """Response whose content is already-encoded JSON bytes."""
+
+    media_type = "application/json"
+
+
+@lru_cache(maxsize=None)
+def get_adapter(response_model: Any) -> TypeAdapter:
+    """TypeAdapter for a response model, built once per model."""
+    return TypeAdapter(response_model)
+
+
+class FastJSONRoute(APIRoute):
+    """APIRoute that dumps ``response_model`` results with pydantic-core.
+
+    FastAPI validates the returned value, converts it to Python primitives,
+    runs them through ``jsonable_encoder`` and only then encodes JSON. Here
+    the endpoint's result is validated and dumped to bytes by the model's
+    cached TypeAdapter in one step, and returned as a ready Response, which
+    FastAPI passes through untouched. ``response_model`` still documents
+    the route in OpenAPI.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        response_model = kwargs.get("response_model")
+        if isinstance(response_model, DefaultPlaceholder):
+            response_model = None
+        if response_model is not None and not getattr(endpoint, "__fast_json__", False):
+            endpoint = self._serialize_with(endpoint, get_adapter(response_model), kwargs)
+        super().__init__(path, endpoint, **kwargs)
+
+    @staticmethod
+    def _serialize_with(
+        endpoint: Callable[..., Any], adapter: TypeAdapter, options: dict[str, Any]
+    ) -> Callable[..., Any]:
+        status_code = options.get("status_code") or 200
+        dump_options = {
+            "by_alias": options.get("response_model_by_alias", True),
+            "exclude_unset": options.get("response_model_exclude_unset", False),
+            "exclude_defaults": options.get("response_model_exclude_defaults", False),
+            "exclude_none": options.get("response_model_exclude_none", False),
+        }
+
+        def render(result: Any) -> Any:
+            if isinstance(result, Response):
+                return result
+            value = adapter.validate_python(result, from_attributes=True)
+            return FastJSONResponse(
+                content=adapter.dump_json(value, **dump_options),
+                status_code=status_code,
+            )
+
+        # Keep sync endpoints sync so FastAPI still runs them in the threadpool
+        if inspect.iscoroutinefunction(endpoint):
+            @wraps(endpoint)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                return render(await endpoint(*args, **kwargs))
+        else:
+            @wraps(endpoint)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                return render(endpoint(*args, **kwargs))
+
+        wrapper.__fast_json__ = True
+        return wrapper
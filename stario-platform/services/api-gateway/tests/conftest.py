@@ -1,56 +1,116 @@
 """
 Pytest configuration and fixtures for API Gateway tests.
+
+Tests run against the Postgres and Redis named by DATABASE_URL and
+REDIS_URL (CI provides both). The schema is created from
+infra/docker/init-db.sql when the database does not have it yet.
 """
-import asyncio
+import os
+
+# Every test client shares one IP; keep the rate limiter out of the way.
+# Set before the app loads its settings
+os.environ.setdefault("RATE_LIMIT_REQUESTS_PER_MINUTE", "100000")
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import AsyncGenerator, Callable, Optional
+
 import pytest
-from typing import AsyncGenerator, Generator
-from httpx import AsyncClient, ASGITransport
+import pytest_asyncio
+from httpx import AsyncClient, ASGITransport, Response
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.pool import NullPool
 from redis.asyncio import Redis
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock
 
 from app.main import app
-from stario_common.database import Base, get_db
-from stario_common.redis_client import get_redis
+from app.pagination import NEXT_CURSOR_HEADER
+from app.routers.artists import invalidate_artist_caches
+from stario_common.config import get_settings
+from stario_common.database import get_session
 from stario_common.auth import create_access_token
 
 
-# Test database URL (use SQLite for tests)
-TEST_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
+SCHEMA_SQL = Path(__file__).resolve().parents[3] / "infra" / "docker" / "init-db.sql"
+
+# Emptied before each test; CASCADE takes the rows that reference them too
+TEST_TABLES = "users, artists, orders, order_items, audit_logs"
+
+
+def tied_timestamps(count: int) -> list[datetime]:
+    """Ascending row timestamps, three rows per value.
+
+    Rows sharing a timestamp make the id tie-break decide the list order,
+    which is what a cursor has to get right.
+    """
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return [base + timedelta(minutes=i // 3) for i in range(count)]
+
+
+def header_cursor(response: Response) -> tuple[list[dict], Optional[str]]:
+    """Items and cursor of a bare-array page (cursor in x-next-cursor)."""
+    return response.json(), response.headers.get(NEXT_CURSOR_HEADER)
+
+
+def body_cursor(response: Response) -> tuple[list[dict], Optional[str]]:
+    """Items and cursor of an enveloped page (``items``/``next_cursor``)."""
+    data = response.json()
+    return data["items"], data["next_cursor"]
 
 
-@pytest.fixture(scope="session")
-def event_loop() -> Generator:
-    """Create event loop for async tests."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+async def walk_cursor_pages(
+    client: AsyncClient,
+    url: str,
+    headers: Optional[dict] = None,
+    page_size: int = 3,
+    next_cursor: Callable[[Response], tuple[list[dict], Optional[str]]] = header_cursor,
+) -> list[str]:
+    """Ids from every page of a list endpoint, following its cursor."""
+    seen = []
+    params = {"page_size": page_size}
+    while True:
+        response = await client.get(url, params=params, headers=headers)
+        assert response.status_code == 200
+        items, cursor = next_cursor(response)
+        seen.extend(item["id"] for item in items)
+        if not cursor:
+            return seen
+        params["cursor"] = cursor
 
 
-@pytest.fixture(scope="session")
+def _database_url() -> str:
+    """DATABASE_URL with the asyncpg driver."""
+    url = get_settings().database_url
+    return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+
+@pytest_asyncio.fixture(scope="session")
 async def engine():
     """Create test database engine."""
     engine = create_async_engine(
-        TEST_DATABASE_URL,
+        _database_url(),
         poolclass=NullPool,
-        echo=False
+        # The schema's tables are queried unqualified
+        connect_args={"server_settings": {"search_path": "stario,public"}},
     )
 
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    async with engine.connect() as conn:
+        if await conn.scalar(text("SELECT to_regclass('stario.users')")) is None:
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.execute(SCHEMA_SQL.read_text())
 
     yield engine
 
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
-
     await engine.dispose()
 
 
-@pytest.fixture
+@pytest_asyncio.fixture
 async def db_session(engine) -> AsyncGenerator[AsyncSession, None]:
-    """Create test database session."""
+    """Create test database session on emptied tables."""
+    async with engine.begin() as conn:
+        await conn.execute(text(f"TRUNCATE {TEST_TABLES} CASCADE"))
+
     async_session = async_sessionmaker(
         engine,
         class_=AsyncSession,
@@ -62,7 +122,7 @@ async def db_session(engine) -> AsyncGenerator[AsyncSession, None]:
         await session.rollback()
 
 
-@pytest.fixture
+@pytest_asyncio.fixture
 async def mock_redis() -> AsyncGenerator[AsyncMock, None]:
     """Create mock Redis client."""
     mock = AsyncMock(spec=Redis)
@@ -76,18 +136,16 @@ async def mock_redis() -> AsyncGenerator[AsyncMock, None]:
     yield mock
 
 
-@pytest.fixture
-async def client(db_session, mock_redis) -> AsyncGenerator[AsyncClient, None]:
+@pytest_asyncio.fixture
+async def client(db_session) -> AsyncGenerator[AsyncClient, None]:
     """Create test HTTP client."""
 
-    async def override_get_db():
+    async def override_get_session():
         yield db_session
 
-    async def override_get_redis():
-        yield mock_redis
-
-    app.dependency_overrides[get_db] = override_get_db
-    app.dependency_overrides[get_redis] = override_get_redis
+    app.dependency_overrides[get_session] = override_get_session
+    # Cached artist pages would outlive the rows truncated above
+    await invalidate_artist_caches()
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
@@ -123,11 +181,9 @@ def test_artist_data() -> dict:
 def auth_headers() -> dict:
     """Create authentication headers for tests."""
     token = create_access_token(
-        data={
-            "sub": "test-user-id",
-            "email": "test@example.com",
-            "role": "user"
-        }
+        user_id="test-user-id",
+        email="test@example.com",
+        role="user",
     )
     return {"Authorization": f"Bearer {token}"}
 
@@ -136,11 +192,9 @@ def auth_headers() -> dict:
 def admin_auth_headers() -> dict:
     """Create admin authentication headers for tests."""
     token = create_access_token(
-        data={
-            "sub": "admin-user-id",
-            "email": "admin@stario.uz",
-            "role": "admin"
-        }
+        user_id="admin-user-id",
+        email="admin@stario.uz",
+        role="admin",
     )
     return {"Authorization": f"Bearer {token}"}
 
@@ -149,11 +203,9 @@ def admin_auth_headers() -> dict:
 def operator_auth_headers() -> dict:
     """Create operator authentication headers for tests."""
     token = create_access_token(
-        data={
-            "sub": "operator-user-id",
-            "email": "operator@stario.uz",
-            "role": "operator"
-        }
+        user_id="operator-user-id",
+        email="operator@stario.uz",
+        role="operator",
     )
     return {"Authorization": f"Bearer {token}"}
 
@@ -162,10 +214,8 @@ def operator_auth_headers() -> dict:
 def validator_auth_headers() -> dict:
     """Create validator authentication headers for tests."""
     token = create_access_token(
-        data={
-            "sub": "validator-user-id",
-            "email": "validator@stario.uz",
-            "role": "validator"
-        }
+        user_id="validator-user-id",
+        email="validator@stario.uz",
+        role="validator",
     )
     return {"Authorization": f"Bearer {token}"}
@@ -3,8 +3,11 @@ Tests for artist management endpoints.
 """
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import text
 from uuid import uuid4
 
+from conftest import body_cursor, tied_timestamps, walk_cursor_pages
+
 
 class TestListArtists:
     """Tests for listing artists."""
@@ -15,7 +18,7 @@ class TestListArtists:
         response = await client.get("/artists")
 
         assert response.status_code == 200
-        assert isinstance(response.json(), list)
+        assert isinstance(response.json()["items"], list)
 
     @pytest.mark.asyncio
     async def test_list_artists_with_category_filter(self, client: AsyncClient):
@@ -41,6 +44,33 @@ class TestListArtists:
 
         assert response.status_code == 200
 
+    @pytest.mark.asyncio
+    async def test_list_artists_cursor_walk(self, client: AsyncClient, db_session):
+        """Test following next_cursor visits every artist once, in list order."""
+        for i, created_at in enumerate(tied_timestamps(7)):
+            await db_session.execute(
+                text("""
+                    INSERT INTO artists (name, category, created_at)
+                    VALUES (:name, 'singer', :created_at)
+                """),
+                {"name": f"Artist {i}", "created_at": created_at},
+            )
+        await db_session.commit()
+
+        full = await client.get("/artists", params={"page_size": 100})
+        expected = [artist["id"] for artist in full.json()["items"]]
+        assert len(expected) == 7
+
+        seen = await walk_cursor_pages(client, "/artists", next_cursor=body_cursor)
+        assert seen == expected
+
+    @pytest.mark.asyncio
+    async def test_list_artists_invalid_cursor(self, client: AsyncClient):
+        """Test a malformed cursor is rejected."""
+        response = await client.get("/artists", params={"cursor": "not-a-cursor"})
+
+        assert response.status_code == 400
+
 
 class TestGetArtist:
     """Tests for getting artist details."""
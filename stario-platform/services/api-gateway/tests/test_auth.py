@@ -1,8 +1,38 @@
 """
 Tests for authentication endpoints.
 """
+import hashlib
+import hmac
+import json
+import time
+from urllib.parse import urlencode
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import text
+
+from app.routers import auth
+from stario_common.auth import create_refresh_token, verify_token
+
+TELEGRAM_BOT_TOKEN = "123456:TEST"
+
+
+def sign_init_data(fields: dict) -> str:
+    """Mini App init data signed the way Telegram signs it."""
+    secret = hmac.new(b"WebAppData", TELEGRAM_BOT_TOKEN.encode(), hashlib.sha256).digest()
+    data_check_string = "\n".join(f"{key}={value}" for key, value in sorted(fields.items()))
+    signature = hmac.new(secret, data_check_string.encode(), hashlib.sha256).hexdigest()
+    return urlencode({**fields, "hash": signature})
+
+
+@pytest.fixture
+def telegram_secret(monkeypatch):
+    """Check init data against TELEGRAM_BOT_TOKEN."""
+    monkeypatch.setattr(
+        auth,
+        "TELEGRAM_SECRET",
+        hmac.new(b"WebAppData", TELEGRAM_BOT_TOKEN.encode(), hashlib.sha256).digest(),
+    )
 
 
 class TestRegistration:
@@ -20,6 +50,21 @@ class TestRegistration:
         assert data["token_type"] == "bearer"
         assert "expires_in" in data
 
+    @pytest.mark.asyncio
+    async def test_register_stores_user(self, client: AsyncClient, db_session, test_user_data: dict):
+        """Test registration writes the user row."""
+        await client.post("/auth/register", json=test_user_data)
+
+        result = await db_session.execute(
+            text("SELECT full_name, phone, role FROM users WHERE email = :email"),
+            {"email": test_user_data["email"]},
+        )
+        user = result.fetchone()
+        assert user is not None
+        assert user.full_name == test_user_data["full_name"]
+        assert user.phone == test_user_data["phone"]
+        assert user.role == "user"
+
     @pytest.mark.asyncio
     async def test_register_invalid_email(self, client: AsyncClient, test_user_data: dict):
         """Test registration with invalid email."""
@@ -68,6 +113,12 @@ class TestLogin:
         assert "access_token" in data
         assert "refresh_token" in data
 
+        me = await client.get("/auth/me", headers={
+            "Authorization": f"Bearer {data['access_token']}"
+        })
+        assert me.status_code == 200
+        assert me.json()["email"] == test_user_data["email"]
+
     @pytest.mark.asyncio
     async def test_login_invalid_password(self, client: AsyncClient, test_user_data: dict):
         """Test login with invalid password."""
@@ -110,6 +161,55 @@ class TestTokenRefresh:
         data = response.json()
         assert "access_token" in data
 
+        me = await client.get("/auth/me", headers={
+            "Authorization": f"Bearer {data['access_token']}"
+        })
+        assert me.status_code == 200
+        assert me.json()["email"] == test_user_data["email"]
+
+    @pytest.mark.asyncio
+    async def test_refresh_keeps_expiry(self, client: AsyncClient, test_user_data: dict):
+        """Test a rotated refresh token expires when the original one does."""
+        reg_response = await client.post("/auth/register", json=test_user_data)
+        refresh_token = reg_response.json()["refresh_token"]
+
+        response = await client.post("/auth/refresh", json={
+            "refresh_token": refresh_token
+        })
+
+        rotated = response.json()["refresh_token"]
+        assert verify_token(rotated).exp == verify_token(refresh_token).exp
+
+    @pytest.mark.asyncio
+    async def test_refresh_legacy_token(self, client: AsyncClient, test_user_data: dict):
+        """Test refresh with an older token that carries no email or role."""
+        reg_response = await client.post("/auth/register", json=test_user_data)
+        me = await client.get("/auth/me", headers={
+            "Authorization": f"Bearer {reg_response.json()['access_token']}"
+        })
+        legacy_token = create_refresh_token(user_id=me.json()["id"])
+
+        response = await client.post("/auth/refresh", json={
+            "refresh_token": legacy_token
+        })
+
+        assert response.status_code == 200
+        me = await client.get("/auth/me", headers={
+            "Authorization": f"Bearer {response.json()['access_token']}"
+        })
+        assert me.json()["email"] == test_user_data["email"]
+
+    @pytest.mark.asyncio
+    async def test_refresh_legacy_token_unknown_user(self, client: AsyncClient):
+        """Test refresh with an older token whose user no longer exists."""
+        legacy_token = create_refresh_token(user_id="00000000-0000-0000-0000-000000000000")
+
+        response = await client.post("/auth/refresh", json={
+            "refresh_token": legacy_token
+        })
+
+        assert response.status_code == 401
+
     @pytest.mark.asyncio
     async def test_refresh_token_invalid(self, client: AsyncClient):
         """Test refresh with invalid token."""
@@ -145,6 +245,69 @@ class TestTelegramAuth:
 
         assert response.status_code in [401, 422]
 
+    @pytest.mark.asyncio
+    async def test_telegram_auth_upserts_user(
+        self, client: AsyncClient, db_session, telegram_secret
+    ):
+        """Test the first Telegram login creates the user and later ones reuse it."""
+        fields = {
+            "auth_date": str(int(time.time())),
+            "query_id": "AAHdF6IQAAAAAN0XohDhrOrc",
+            "user": json.dumps({"id": 123456789, "first_name": "Test", "username": "tester"}),
+        }
+
+        user_ids = []
+        for _ in range(2):
+            response = await client.post("/auth/telegram", json={
+                "init_data": sign_init_data(fields)
+            })
+            assert response.status_code == 200
+            me = await client.get("/auth/me", headers={
+                "Authorization": f"Bearer {response.json()['access_token']}"
+            })
+            assert me.json()["email"] == "123456789@telegram.stario.uz"
+            user_ids.append(me.json()["id"])
+
+        assert user_ids[0] == user_ids[1]
+        result = await db_session.execute(
+            text("SELECT full_name, telegram_username FROM users WHERE telegram_id = :id"),
+            {"id": "123456789"},
+        )
+        users = result.fetchall()
+        assert len(users) == 1
+        assert users[0].full_name == "Test"
+        assert users[0].telegram_username == "tester"
+
+    @pytest.mark.asyncio
+    async def test_telegram_auth_bad_signature(self, client: AsyncClient, telegram_secret):
+        """Test Telegram auth with init data that was altered after signing."""
+        fields = {
+            "auth_date": str(int(time.time())),
+            "user": json.dumps({"id": 123456789, "first_name": "Test"}),
+        }
+        init_data = sign_init_data(fields).replace("Test", "Evil")
+
+        response = await client.post("/auth/telegram", json={
+            "init_data": init_data
+        })
+
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_telegram_auth_expired(self, client: AsyncClient, telegram_secret):
+        """Test Telegram auth refuses correctly signed but stale init data."""
+        fields = {
+            "auth_date": str(int(time.time()) - auth.TELEGRAM_AUTH_MAX_AGE_SECONDS - 60),
+            "user": json.dumps({"id": 123456789, "first_name": "Test"}),
+        }
+
+        response = await client.post("/auth/telegram", json={
+            "init_data": sign_init_data(fields)
+        })
+
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Telegram auth data has expired"
+
 
 class TestProtectedEndpoints:
     """Tests for protected endpoint access."""
@@ -0,0 +1,104 @@
+"""
+Tests for content moderation endpoints.
+"""
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+from uuid import uuid4
+
+from conftest import tied_timestamps, walk_cursor_pages
+from stario_common.redis_client import get_redis
+
+
+class TestAuditLogs:
+    """Tests for the audit log listing."""
+
+    @pytest.mark.asyncio
+    async def test_audit_logs_requires_admin(self, client: AsyncClient, auth_headers: dict):
+        """Test regular users cannot read audit logs."""
+        response = await client.get("/content/audit-logs", headers=auth_headers)
+
+        assert response.status_code == 403
+
+    @pytest.mark.asyncio
+    async def test_audit_logs_cursor_walk(
+        self, client: AsyncClient, db_session, admin_auth_headers: dict
+    ):
+        """Test following x-next-cursor visits every entry once, in list order."""
+        for i, timestamp in enumerate(tied_timestamps(7)):
+            await db_session.execute(
+                text("""
+                    INSERT INTO audit_logs (timestamp, action, actor_id, resource_type, resource_id)
+                    VALUES (:timestamp, 'artist.update', 'admin-user-id', 'artist', :resource_id)
+                """),
+                {"timestamp": timestamp, "resource_id": str(i)},
+            )
+        await db_session.commit()
+
+        full = await client.get(
+            "/content/audit-logs", params={"page_size": 100}, headers=admin_auth_headers
+        )
+        expected = [entry["id"] for entry in full.json()]
+        assert len(expected) == 7
+        assert "x-next-cursor" not in full.headers
+
+        seen = await walk_cursor_pages(client, "/content/audit-logs", admin_auth_headers)
+        assert seen == expected
+
+    @pytest.mark.asyncio
+    async def test_audit_logs_invalid_cursor(self, client: AsyncClient, admin_auth_headers: dict):
+        """Test a malformed cursor is rejected."""
+        response = await client.get(
+            "/content/audit-logs", params={"cursor": "not-a-cursor"}, headers=admin_auth_headers
+        )
+
+        assert response.status_code == 400
+
+
+class TestLegalExport:
+    """Tests for queuing legal exports and reading their status."""
+
+    @pytest.mark.asyncio
+    async def test_legal_export_status_reads_queued_job(
+        self, client: AsyncClient, admin_auth_headers: dict
+    ):
+        """Test a queued export is pending, then reports the worker's result."""
+        response = await client.post("/content/legal-export", json={
+            "case_id": "case-42",
+            "date_from": "2025-01-01T00:00:00Z",
+            "date_to": "2025-02-01T00:00:00Z",
+        }, headers=admin_auth_headers)
+        assert response.status_code == 200
+        created = response.json()
+
+        response = await client.get(
+            f"/content/legal-export/{created['export_id']}", headers=admin_auth_headers
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "pending"
+        assert data["download_url"] is None
+        assert data["created_at"] == created["created_at"]
+
+        redis = await get_redis()
+        await redis.update_job(created["export_id"], "completed", result={
+            "download_url": "https://storage.example/case-42.zip",
+            "record_count": 12,
+        })
+
+        response = await client.get(
+            f"/content/legal-export/{created['export_id']}", headers=admin_auth_headers
+        )
+        data = response.json()
+        assert data["status"] == "completed"
+        assert data["download_url"] == "https://storage.example/case-42.zip"
+        assert data["record_count"] == 12
+
+    @pytest.mark.asyncio
+    async def test_legal_export_status_unknown(self, client: AsyncClient, admin_auth_headers: dict):
+        """Test an unknown export id is not found."""
+        response = await client.get(
+            f"/content/legal-export/{uuid4()}", headers=admin_auth_headers
+        )
+
+        assert response.status_code == 404
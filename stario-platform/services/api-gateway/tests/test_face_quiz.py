@@ -2,9 +2,15 @@
 Tests for Face Quiz endpoints.
 """
 import pytest
+from datetime import datetime, timezone
 from httpx import AsyncClient
+from sqlalchemy import text
 from uuid import uuid4
 
+from app.routers.face_quiz import leaderboard_key
+from stario_common.auth import create_access_token
+from stario_common.redis_client import get_redis
+
 
 class TestStartFaceQuiz:
     """Tests for starting face quiz."""
@@ -78,6 +84,66 @@ class TestAnalyzeFace:
         assert response.status_code in [404, 422]
 
 
+class TestBatchAnalyzeFace:
+    """Tests for comparing one photo with many artists (AI_MODE=mock)."""
+
+    @pytest.mark.asyncio
+    async def test_batch_analyze_top_k(self, client: AsyncClient, auth_headers: dict):
+        """Test only the top_k best matches come back, best first."""
+        artist_ids = [str(uuid4()) for _ in range(20)]
+        response = await client.post(f"/face-quiz/{uuid4()}/batch-analyze", json={
+            "artist_ids": artist_ids,
+            "top_k": 5
+        }, headers=auth_headers)
+
+        assert response.status_code == 200
+        results = response.json()
+        assert len(results) == 5
+        scores = [result["similarity_score"] for result in results]
+        assert scores == sorted(scores, reverse=True)
+        returned_ids = [result["artist_id"] for result in results]
+        assert len(set(returned_ids)) == 5
+        assert set(returned_ids) <= set(artist_ids)
+
+    @pytest.mark.asyncio
+    async def test_batch_analyze_fewer_than_top_k(self, client: AsyncClient, auth_headers: dict):
+        """Test every candidate comes back when there are fewer than top_k."""
+        artist_ids = [str(uuid4()) for _ in range(3)]
+        response = await client.post(f"/face-quiz/{uuid4()}/batch-analyze", json={
+            "artist_ids": artist_ids
+        }, headers=auth_headers)
+
+        assert response.status_code == 200
+        assert sorted(result["artist_id"] for result in response.json()) == sorted(artist_ids)
+
+    @pytest.mark.asyncio
+    async def test_batch_analyze_no_artists(self, client: AsyncClient, auth_headers: dict):
+        """Test an empty candidate list is rejected."""
+        response = await client.post(f"/face-quiz/{uuid4()}/batch-analyze", json={
+            "artist_ids": []
+        }, headers=auth_headers)
+
+        assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_batch_analyze_too_many_artists(self, client: AsyncClient, auth_headers: dict):
+        """Test more than 500 candidates are rejected."""
+        response = await client.post(f"/face-quiz/{uuid4()}/batch-analyze", json={
+            "artist_ids": [str(uuid4()) for _ in range(501)]
+        }, headers=auth_headers)
+
+        assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_batch_analyze_unauthorized(self, client: AsyncClient):
+        """Test batch analysis without authentication."""
+        response = await client.post(f"/face-quiz/{uuid4()}/batch-analyze", json={
+            "artist_ids": [str(uuid4())]
+        })
+
+        assert response.status_code == 401
+
+
 class TestFaceQuizResult:
     """Tests for getting quiz results."""
 
@@ -119,6 +185,50 @@ class TestFaceQuizLeaderboard:
 
         assert response.status_code in [200, 404]
 
+    @pytest.mark.asyncio
+    async def test_leaderboard_after_analyze(
+        self, client: AsyncClient, db_session, auth_headers: dict
+    ):
+        """Test analyzed quizzes rank on the leaderboard, with non-UUID subjects anonymous."""
+        # AI_MODE=mock scores every quiz against art_001
+        redis = await get_redis()
+        await redis.client.delete(
+            leaderboard_key("art_001", "all_time", datetime.now(timezone.utc))
+        )
+        result = await db_session.execute(
+            text("""
+                INSERT INTO users (email, full_name, telegram_username)
+                VALUES ('quiz@example.com', 'Quiz Taker', 'quiztaker')
+                RETURNING id
+            """)
+        )
+        user_id = str(result.scalar())
+        await db_session.commit()
+        user_headers = {
+            "Authorization": "Bearer " + create_access_token(
+                user_id=user_id, email="quiz@example.com", role="user"
+            )
+        }
+
+        for headers in (user_headers, auth_headers):
+            response = await client.post(
+                f"/face-quiz/{uuid4()}/analyze", headers=headers
+            )
+            assert response.status_code == 200
+
+        response = await client.get("/face-quiz/leaderboard", params={
+            "artist_id": "art_001",
+            "period": "all_time",
+        })
+
+        assert response.status_code == 200
+        entries = response.json()
+        assert [entry["rank"] for entry in entries] == [1, 2]
+        scores = [entry["similarity_score"] for entry in entries]
+        assert scores == sorted(scores, reverse=True)
+        usernames = {entry["user_id"]: entry["username"] for entry in entries}
+        assert usernames == {user_id: "quiztaker", "test-user-id": "anonymous"}
+
 
 class TestFaceQuizShare:
     """Tests for sharing quiz results."""
@@ -0,0 +1,75 @@
+"""
+Tests for order endpoints.
+"""
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import text
+
+from conftest import tied_timestamps, walk_cursor_pages
+from stario_common.auth import create_access_token
+
+
+@pytest_asyncio.fixture
+async def order_owner(db_session) -> dict:
+    """User with seven orders, three of them sharing a timestamp."""
+    result = await db_session.execute(
+        text("INSERT INTO users (email) VALUES ('buyer@example.com') RETURNING id")
+    )
+    user_id = result.scalar()
+    for created_at in tied_timestamps(7):
+        await db_session.execute(
+            text("""
+                INSERT INTO orders (user_id, subtotal_uzs, total_uzs, created_at)
+                VALUES (:user_id, 1000, 1000, :created_at)
+            """),
+            {"user_id": user_id, "created_at": created_at},
+        )
+    await db_session.commit()
+
+    token = create_access_token(user_id=str(user_id), email="buyer@example.com", role="user")
+    return {"Authorization": f"Bearer {token}"}
+
+
+class TestListOrders:
+    """Tests for listing orders."""
+
+    @pytest.mark.asyncio
+    async def test_list_orders_cursor_walk(self, client: AsyncClient, order_owner: dict):
+        """Test following x-next-cursor visits every order once, in list order."""
+        full = await client.get("/orders", params={"page_size": 100}, headers=order_owner)
+        expected = [order["id"] for order in full.json()]
+        assert len(expected) == 7
+
+        assert await walk_cursor_pages(client, "/orders", order_owner) == expected
+
+    @pytest.mark.asyncio
+    async def test_list_all_orders_cursor_walk(
+        self, client: AsyncClient, order_owner: dict, admin_auth_headers: dict
+    ):
+        """Test the admin listing pages by the same cursor."""
+        full = await client.get(
+            "/orders/admin/all", params={"page_size": 100}, headers=admin_auth_headers
+        )
+        expected = [order["id"] for order in full.json()]
+        assert len(expected) == 7
+
+        seen = await walk_cursor_pages(client, "/orders/admin/all", admin_auth_headers, page_size=2)
+        assert seen == expected
+
+    @pytest.mark.asyncio
+    async def test_list_orders_non_uuid_subject(self, client: AsyncClient, auth_headers: dict):
+        """Test a token whose subject is not a UUID sees no orders."""
+        response = await client.get("/orders", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json() == []
+
+    @pytest.mark.asyncio
+    async def test_list_orders_invalid_cursor(self, client: AsyncClient, order_owner: dict):
+        """Test a malformed cursor is rejected."""
+        response = await client.get(
+            "/orders", params={"cursor": "not-a-cursor"}, headers=order_owner
+        )
+
+        assert response.status_code == 400
@@ -0,0 +1,191 @@
+"""
+Legal export worker - builds evidence packages from the Redis queue.
+
+The API gateway only queues an export; the package itself can take minutes
+to assemble, so it is built here, off the request path, and uploaded to S3.
+"""
+
+import asyncio
+import tempfile
+import time
+import zipfile
+from datetime import datetime
+from typing import Optional
+
+import orjson
+from sqlalchemy import text
+
+from stario_common.config import get_settings
+from stario_common.database import get_db
+from stario_common.logging import get_logger
+from stario_common.redis_client import get_redis
+from stario_common.s3_client import get_s3
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+LEGAL_EXPORT_QUEUE = "legal_export"
+
+# Rows fetched from the server-side cursor and written per step
+EXPORT_CHUNK_ROWS = 1000
+# Packages stay in memory up to this size before spilling to disk
+EXPORT_SPOOL_MAX_BYTES = 64 * 1024 * 1024
+# Longest lifetime S3 allows for a SigV4 presigned URL
+EXPORT_URL_EXPIRES_SECONDS = 7 * 24 * 3600
+
+# Resource -> (SELECT ... FROM, timestamp column, user column, content column).
+# Event-like resources are limited to the requested period by their timestamp
+# column. Records (users, orders) have none: they are selected by user alone,
+# so a user who registered or ordered before the period is still exported.
+# The user and content filters apply only where the resource has a matching
+# column; without them, a record resource is exported in full
+EXPORT_RESOURCES: dict[str, tuple[str, Optional[str], Optional[str], Optional[str]]] = {
+    "users": (
+        "SELECT id, email, full_name, phone, telegram_id, telegram_username, role, "
+        "is_active, is_verified, created_at, updated_at, deleted_at FROM users",
+        None, "id", None,
+    ),
+    "videos": ("SELECT * FROM videos", "created_at", "user_id", "id"),
+    "audit_logs": ("SELECT * FROM audit_logs", "timestamp", "actor_id", "resource_id"),
+    "orders": ("SELECT * FROM orders", None, "user_id", None),
+    "payments": (
+        "SELECT payments.* FROM payments JOIN orders ON orders.id = payments.order_id",
+        "payments.created_at", "orders.user_id", None,
+    ),
+}
+
+
+def export_query(resource: str, user_ids: Optional[list], content_ids: Optional[list]) -> str:
+    """SQL selecting one resource's rows for an export."""
+    select_sql, time_column, user_column, content_column = EXPORT_RESOURCES[resource]
+    where_clauses = []
+    if time_column:
+        where_clauses.append(f"{time_column} BETWEEN :date_from AND :date_to")
+    if user_ids and user_column:
+        where_clauses.append(f"{user_column} = ANY(:user_ids)")
+    if content_ids and content_column:
+        where_clauses.append(f"{content_column} = ANY(:content_ids)")
+    if not where_clauses:
+        return select_sql
+    return f"{select_sql} WHERE {' AND '.join(where_clauses)}"
+
+
+class LegalExportWorker:
+    """Worker that builds legal export packages from the queue, one at a time."""
+
+    def __init__(self):
+        self._running = False
+
+    async def start(self) -> None:
+        """Start the worker."""
+        self._running = True
+        logger.info("Legal export worker started")
+
+        while self._running:
+            try:
+                await self._process_queue()
+            except Exception as e:
+                logger.error("Legal export worker error", error=str(e))
+                await asyncio.sleep(1)
+
+    async def stop(self) -> None:
+        """Stop the worker."""
+        self._running = False
+        logger.info("Legal export worker stopped")
+
+    async def _process_queue(self) -> None:
+        """Take the next export off the queue, if any."""
+        redis = await get_redis()
+        job = await redis.dequeue(LEGAL_EXPORT_QUEUE, timeout=1)
+        if not job:
+            return
+
+        logger.info("Processing legal export", export_id=job["id"])
+        await self._process_job(job["id"], job["data"])
+
+    async def _process_job(self, export_id: str, job_data: dict) -> None:
+        """Build, upload and publish one export package."""
+        redis = await get_redis()
+        start_time = time.time()
+
+        try:
+            await redis.update_job(export_id, "processing")
+
+            resources = ["users", "orders", "payments"]
+            if job_data.get("include_content", True):
+                resources.append("videos")
+            if job_data.get("include_logs", True):
+                resources.append("audit_logs")
+
+            params = {
+                "date_from": datetime.fromisoformat(job_data["date_from"]),
+                "date_to": datetime.fromisoformat(job_data["date_to"]),
+                "user_ids": job_data.get("user_ids"),
+                "content_ids": job_data.get("content_ids"),
+            }
+
+            with tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_BYTES) as package:
+                record_counts = await self._write_package(package, resources, params)
+                package.seek(0)
+
+                s3 = get_s3()
+                key = f"legal/{job_data['case_id']}/{export_id}.zip"
+                await asyncio.to_thread(
+                    s3.upload_file, package, settings.s3_bucket_exports, key, "application/zip"
+                )
+
+            download_url = s3.get_presigned_url(
+                settings.s3_bucket_exports, key, expires_in=EXPORT_URL_EXPIRES_SECONDS
+            )
+            record_count = sum(record_counts.values())
+
+            await redis.update_job(
+                export_id,
+                "completed",
+                result={
+                    "download_url": download_url,
+                    "record_count": record_count,
+                    "records": record_counts,
+                },
+            )
+
+            logger.info(
+                "Legal export completed",
+                export_id=export_id,
+                record_count=record_count,
+                processing_time_ms=int((time.time() - start_time) * 1000),
+            )
+
+        except Exception as e:
+            await redis.update_job(export_id, "failed", result={"error": str(e)})
+
+            logger.error(
+                "Legal export failed",
+                export_id=export_id,
+                error=str(e),
+            )
+
+    async def _write_package(self, package, resources: list[str], params: dict) -> dict[str, int]:
+        """Stream each resource into the zip as NDJSON. Returns row counts."""
+        record_counts = {}
+
+        async with get_db().session() as session:
+            with zipfile.ZipFile(package, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+                for resource in resources:
+                    query = export_query(resource, params["user_ids"], params["content_ids"])
+                    result = await session.stream(text(query), params)
+                    count = 0
+
+                    with archive.open(f"{resource}.ndjson", "w") as member:
+                        async for rows in result.mappings().partitions(EXPORT_CHUNK_ROWS):
+                            chunk = b"".join(
+                                orjson.dumps(dict(row), default=str, option=orjson.OPT_APPEND_NEWLINE)
+                                for row in rows
+                            )
+                            # Compression is CPU-bound; keep it off the event loop
+                            await asyncio.to_thread(member.write, chunk)
+                            count += len(rows)
+
+                    record_counts[resource] = count
+
+        return record_counts
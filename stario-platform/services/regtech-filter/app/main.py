@@ -24,18 +24,37 @@ from stario_common.metrics import get_metrics
 from stario_common.auth import User, get_current_user, require_role, Roles
 from stario_common.redis_client import get_redis
 
+from .legal_export import LegalExportWorker
+from .retention import RetentionCleanupWorker
+
 setup_logging("regtech-filter")
 logger = get_logger(__name__)
 audit_logger = AuditLogger("regtech-filter")
 settings = get_settings()
 
+legal_export_worker: Optional[LegalExportWorker] = None
+retention_cleanup_worker: Optional[RetentionCleanupWorker] = None
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan events."""
+    global legal_export_worker, retention_cleanup_worker
     logger.info("Starting RegTech Filter Service", version="1.0.0")
     get_metrics("regtech-filter")
+
+    # Legal exports and retention cleanups queued by the API gateway run here
+    legal_export_worker = LegalExportWorker()
+    asyncio.create_task(legal_export_worker.start())
+    retention_cleanup_worker = RetentionCleanupWorker()
+    asyncio.create_task(retention_cleanup_worker.start())
+
     yield
+
+    if legal_export_worker:
+        await legal_export_worker.stop()
+    if retention_cleanup_worker:
+        await retention_cleanup_worker.stop()
     logger.info("RegTech Filter Service shutdown complete")
 
 
@@ -0,0 +1,112 @@
+"""
+Retention cleanup worker - purges expired audit logs from the Redis queue.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from stario_common.config import get_settings
+from stario_common.database import get_db
+from stario_common.logging import get_logger
+from stario_common.redis_client import get_redis
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+RETENTION_CLEANUP_QUEUE = "retention_cleanup"
+
+# Rows removed per transaction, so a large backlog never holds locks or
+# grows one transaction for long
+RETENTION_DELETE_BATCH_ROWS = 10_000
+
+DELETE_EXPIRED_AUDIT_LOGS_SQL = text("""
+    DELETE FROM audit_logs
+    WHERE id IN (
+        SELECT id FROM audit_logs
+        WHERE timestamp < :cutoff
+        LIMIT :batch_rows
+    )
+""")
+
+
+class RetentionCleanupWorker:
+    """Worker that runs queued retention cleanups, one at a time."""
+
+    def __init__(self):
+        self._running = False
+
+    async def start(self) -> None:
+        """Start the worker."""
+        self._running = True
+        logger.info("Retention cleanup worker started")
+
+        while self._running:
+            try:
+                await self._process_queue()
+            except Exception as e:
+                logger.error("Retention cleanup worker error", error=str(e))
+                await asyncio.sleep(1)
+
+    async def stop(self) -> None:
+        """Stop the worker."""
+        self._running = False
+        logger.info("Retention cleanup worker stopped")
+
+    async def _process_queue(self) -> None:
+        """Take the next cleanup off the queue, if any."""
+        redis = await get_redis()
+        job = await redis.dequeue(RETENTION_CLEANUP_QUEUE, timeout=1)
+        if not job:
+            return
+
+        logger.info("Processing retention cleanup", job_id=job["id"])
+        await self._process_job(job["id"], job["data"])
+
+    async def _process_job(self, job_id: str, job_data: dict) -> None:
+        """Delete audit logs older than the retention period, batch by batch."""
+        redis = await get_redis()
+        start_time = time.time()
+
+        retention_days = job_data.get("retention_days", settings.audit_log_retention_days)
+        cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+        deleted = 0
+
+        try:
+            await redis.update_job(job_id, "processing")
+
+            while True:
+                async with get_db().session() as session:
+                    result = await session.execute(
+                        DELETE_EXPIRED_AUDIT_LOGS_SQL,
+                        {"cutoff": cutoff, "batch_rows": RETENTION_DELETE_BATCH_ROWS},
+                    )
+                deleted += result.rowcount
+                if result.rowcount < RETENTION_DELETE_BATCH_ROWS:
+                    break
+
+            await redis.update_job(
+                job_id,
+                "completed",
+                result={"deleted_audit_logs": deleted, "cutoff": cutoff.isoformat()},
+            )
+
+            logger.info(
+                "Retention cleanup completed",
+                job_id=job_id,
+                deleted_audit_logs=deleted,
+                processing_time_ms=int((time.time() - start_time) * 1000),
+            )
+
+        except Exception as e:
+            await redis.update_job(
+                job_id, "failed", result={"error": str(e), "deleted_audit_logs": deleted}
+            )
+
+            logger.error(
+                "Retention cleanup failed",
+                job_id=job_id,
+                error=str(e),
+            )
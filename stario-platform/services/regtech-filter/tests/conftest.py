@@ -0,0 +1,69 @@
+"""
+Pytest configuration and fixtures for RegTech filter tests.
+
+Tests run against the Postgres and Redis named by DATABASE_URL and
+REDIS_URL (CI provides both). The schema is created from
+infra/docker/init-db.sql when the database does not have it yet.
+"""
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncGenerator
+
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
+
+from stario_common.config import get_settings
+
+
+SCHEMA_SQL = Path(__file__).resolve().parents[3] / "infra" / "docker" / "init-db.sql"
+
+
+class SchemaDatabase:
+    """Stand-in for get_db() whose sessions resolve tables in the stario schema."""
+
+    def __init__(self, engine):
+        self._session_factory = async_sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+
+    @asynccontextmanager
+    async def session(self) -> AsyncGenerator[AsyncSession, None]:
+        """Session committed on exit, like Database.session()."""
+        async with self._session_factory() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+
+@pytest_asyncio.fixture(scope="session")
+async def engine():
+    """Create test database engine."""
+    url = get_settings().database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    engine = create_async_engine(
+        url,
+        poolclass=NullPool,
+        # The schema's tables are queried unqualified
+        connect_args={"server_settings": {"search_path": "stario,public"}},
+    )
+
+    async with engine.connect() as conn:
+        if await conn.scalar(text("SELECT to_regclass('stario.users')")) is None:
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.execute(SCHEMA_SQL.read_text())
+
+    yield engine
+
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def db(engine) -> SchemaDatabase:
+    """Database for the workers, on emptied audit logs."""
+    async with engine.begin() as conn:
+        await conn.execute(text("TRUNCATE audit_logs"))
+    return SchemaDatabase(engine)
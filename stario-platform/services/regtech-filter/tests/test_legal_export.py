@@ -0,0 +1,79 @@
+"""
+Tests for the legal export worker.
+"""
+import pytest
+
+from app.legal_export import EXPORT_RESOURCES, export_query
+
+PERIOD = "BETWEEN :date_from AND :date_to"
+
+
+class TestExportQuery:
+    """Tests for the SQL each resource is exported with."""
+
+    @pytest.mark.parametrize("resource", ["users", "orders"])
+    def test_records_ignore_period(self, resource: str):
+        """Test record resources are not limited to the export period."""
+        query = export_query(resource, None, None)
+
+        assert query == EXPORT_RESOURCES[resource][0]
+        assert "WHERE" not in query
+
+    @pytest.mark.parametrize("resource, time_column", [
+        ("videos", "created_at"),
+        ("audit_logs", "timestamp"),
+        ("payments", "payments.created_at"),
+    ])
+    def test_events_limited_to_period(self, resource: str, time_column: str):
+        """Test event resources are limited to the export period."""
+        query = export_query(resource, None, None)
+
+        assert query.endswith(f" WHERE {time_column} {PERIOD}")
+
+    @pytest.mark.parametrize("resource, user_column", [
+        ("users", "id"),
+        ("videos", "user_id"),
+        ("audit_logs", "actor_id"),
+        ("orders", "user_id"),
+        ("payments", "orders.user_id"),
+    ])
+    def test_user_filter(self, resource: str, user_column: str):
+        """Test user_ids filter every resource by its user column."""
+        query = export_query(resource, ["u1"], None)
+
+        assert f"{user_column} = ANY(:user_ids)" in query
+        assert query.count(" WHERE ") == 1
+
+    def test_records_with_user_filter_only(self):
+        """Test a record resource is filtered by user alone, not by period."""
+        query = export_query("orders", ["u1"], None)
+
+        assert query == "SELECT * FROM orders WHERE user_id = ANY(:user_ids)"
+
+    @pytest.mark.parametrize("resource, content_column", [
+        ("videos", "id"),
+        ("audit_logs", "resource_id"),
+    ])
+    def test_content_filter(self, resource: str, content_column: str):
+        """Test content_ids filter the resources that have content."""
+        query = export_query(resource, None, ["c1"])
+
+        assert f"{content_column} = ANY(:content_ids)" in query
+
+    @pytest.mark.parametrize("resource", ["users", "orders", "payments"])
+    def test_content_filter_ignored_without_column(self, resource: str):
+        """Test content_ids leave resources without content unfiltered by them."""
+        assert ":content_ids" not in export_query(resource, None, ["c1"])
+
+    def test_all_filters_combined(self):
+        """Test period, user and content filters are ANDed together."""
+        query = export_query("audit_logs", ["u1"], ["c1"])
+
+        assert query == (
+            f"SELECT * FROM audit_logs WHERE timestamp {PERIOD}"
+            " AND actor_id = ANY(:user_ids) AND resource_id = ANY(:content_ids)"
+        )
+
+    def test_empty_filters_ignored(self):
+        """Test empty id lists do not filter anything."""
+        assert export_query("orders", [], []) == "SELECT * FROM orders"
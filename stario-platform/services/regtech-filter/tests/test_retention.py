@@ -0,0 +1,50 @@
+"""
+Tests for the retention cleanup worker.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import text
+
+from app import retention
+from app.retention import RetentionCleanupWorker
+from stario_common.redis_client import get_redis
+
+
+class TestRetentionCleanup:
+    """Tests for running a queued cleanup."""
+
+    @pytest.mark.asyncio
+    async def test_deletes_only_expired_audit_logs(self, db, monkeypatch):
+        """Test logs past the retention period are deleted and the rest kept."""
+        monkeypatch.setattr(retention, "get_db", lambda: db)
+        # Several batches, the last one partial
+        monkeypatch.setattr(retention, "RETENTION_DELETE_BATCH_ROWS", 2)
+
+        now = datetime.now(timezone.utc)
+        ages = {"expired": [91, 120, 200, 365, 400], "fresh": [0, 30, 89]}
+        async with db.session() as session:
+            for kind, days in ages.items():
+                for age in days:
+                    await session.execute(
+                        text("""
+                            INSERT INTO audit_logs (timestamp, action, actor_id, resource_type, resource_id)
+                            VALUES (:timestamp, 'artist.update', 'admin', 'artist', :kind)
+                        """),
+                        {"timestamp": now - timedelta(days=age), "kind": kind},
+                    )
+
+        redis = await get_redis()
+        job_data = {"retention_days": 90, "requested_by": "admin"}
+        job_id = await redis.enqueue(retention.RETENTION_CLEANUP_QUEUE, job_data)
+
+        await RetentionCleanupWorker()._process_job(job_id, job_data)
+
+        job = await redis.get_job(job_id)
+        assert job["status"] == "completed"
+        assert job["result"]["deleted_audit_logs"] == len(ages["expired"])
+
+        async with db.session() as session:
+            result = await session.execute(text("SELECT resource_id FROM audit_logs"))
+            remaining = [row.resource_id for row in result]
+        assert remaining == ["fresh"] * len(ages["fresh"])
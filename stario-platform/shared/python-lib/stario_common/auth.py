@@ -14,7 +14,8 @@ from pydantic import BaseModel
 from .config import get_settings
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# New hashes use argon2id; existing bcrypt hashes still verify
+pwd_context = CryptContext(schemes=["argon2", "bcrypt"], deprecated="auto")
 
 # Security schemes
 bearer_scheme = HTTPBearer(auto_error=False)
@@ -83,15 +84,28 @@ def create_access_token(
     return jwt.encode(payload, settings.jwt_secret, algorithm=settings.jwt_algorithm)
 
 
-def create_refresh_token(user_id: str) -> str:
-    """Create a JWT refresh token."""
+def create_refresh_token(
+    user_id: str,
+    email: Optional[str] = None,
+    role: str = "user",
+    expires_at: Optional[datetime] = None,
+) -> str:
+    """Create a JWT refresh token.
+
+    Email and role ride along so a refresh can mint the next access token
+    without looking the user up. A token rotated from those claims passes
+    the old token's ``exp`` as ``expires_at``, so rotation never extends how
+    long unchecked claims stay usable.
+    """
     settings = get_settings()
 
     now = datetime.utcnow()
-    expire = now + timedelta(days=settings.jwt_refresh_token_expire_days)
+    expire = expires_at or now + timedelta(days=settings.jwt_refresh_token_expire_days)
 
     payload = {
         "user_id": user_id,
+        "email": email,
+        "role": role,
         "exp": expire,
         "iat": now,
         "type": "refresh",
@@ -34,6 +34,7 @@ class Settings(BaseSettings):
     s3_bucket_uploads: str = "stario-uploads"
     s3_bucket_generated: str = "stario-generated"
     s3_bucket_assets: str = "stario-assets"
+    s3_bucket_exports: str = "stario-exports"
     s3_region: str = "us-east-1"
 
     # Authentication
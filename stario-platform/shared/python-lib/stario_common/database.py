@@ -6,7 +6,12 @@ from contextlib import asynccontextmanager
 from typing import AsyncGenerator, Optional
 
 from sqlalchemy import MetaData, create_engine
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 from .config import get_settings
@@ -39,10 +44,13 @@ class Database:
         else:
             async_url = url
 
+        # Pre-ping replaces connections the server dropped while idle,
+        # instead of failing the first query that checks one out
         self._async_engine = create_async_engine(
             async_url,
             pool_size=settings.database_pool_size,
             max_overflow=settings.database_max_overflow,
+            pool_pre_ping=True,
             echo=settings.debug,
         )
 
@@ -67,6 +75,11 @@ class Database:
             autoflush=False,
         )
 
+    @property
+    def engine(self) -> AsyncEngine:
+        """The async engine, for work that needs a bare pooled connection."""
+        return self._async_engine
+
     @asynccontextmanager
     async def session(self) -> AsyncGenerator[AsyncSession, None]:
         """Get an async database session."""
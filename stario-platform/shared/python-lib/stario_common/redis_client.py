@@ -2,14 +2,51 @@
 Redis client for caching and job queues.
 """
 
-import json
-from typing import Any, Optional
+import time
+import uuid
+from typing import Any, AsyncIterator, Optional, Union
 
+import orjson
 import redis.asyncio as redis
 from redis.asyncio import Redis
 
 from .config import get_settings
 
+# Payloads stay JSON so every service reads them the same way; orjson just
+# encodes and parses them faster. Datetimes go through str() as before.
+DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def dumps(value: Any) -> bytes:
+    """Serialize a payload for Redis."""
+    return orjson.dumps(value, default=str, option=DUMPS_OPTIONS)
+
+
+# Sliding-window rate limit, applied atomically in one round-trip.
+# KEYS[1] = limit key, ARGV = now_ms, window_ms, max_requests, member,
+# admitted (requests already let through elsewhere, counted before the check).
+# Returns {allowed (0/1), remaining}.
+RATE_LIMIT_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local admitted = tonumber(ARGV[5])
+
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+for i = 1, admitted do
+    redis.call('ZADD', key, now, ARGV[4] .. '-' .. i)
+end
+local count = redis.call('ZCARD', key)
+if count >= limit then
+    return {0, 0}
+end
+
+redis.call('ZADD', key, now, ARGV[4])
+redis.call('PEXPIRE', key, window)
+return {1, limit - count - 1}
+"""
+
 
 class RedisClient:
     """Redis client wrapper with caching and queue support."""
@@ -20,6 +57,7 @@ class RedisClient:
         self._client: Optional[Redis] = None
         self._cache_client: Optional[Redis] = None
         self._queue_client: Optional[Redis] = None
+        self._rate_limit_script = None
 
     async def connect(self) -> None:
         """Connect to Redis."""
@@ -33,6 +71,9 @@ class RedisClient:
         self._cache_client = await redis.from_url(cache_url, decode_responses=True)
         self._queue_client = await redis.from_url(queue_url, decode_responses=True)
 
+        # Script objects call EVALSHA and load the script on NOSCRIPT
+        self._rate_limit_script = self._client.register_script(RATE_LIMIT_SCRIPT)
+
     async def close(self) -> None:
         """Close Redis connections."""
         if self._client:
@@ -56,24 +97,24 @@ class RedisClient:
             raise RuntimeError("Redis not connected")
         value = await self._cache_client.get(key)
         if value:
-            return json.loads(value)
+            return orjson.loads(value)
         return None
 
     async def cache_set(
-        self, key: str, value: Any, ttl_seconds: int = 3600
+        self, key: str, value: Any, ttl_seconds: Optional[int] = 3600
     ) -> None:
-        """Set a value in cache with TTL."""
+        """Set a value in cache with TTL (None keeps it until overwritten)."""
         if not self._cache_client:
             raise RuntimeError("Redis not connected")
-        await self._cache_client.setex(
-            key, ttl_seconds, json.dumps(value, default=str)
+        await self._cache_client.set(
+            key, dumps(value), ex=ttl_seconds
         )
 
-    async def cache_delete(self, key: str) -> None:
-        """Delete a key from cache."""
+    async def cache_delete(self, *keys: str) -> None:
+        """Delete one or more keys from cache."""
         if not self._cache_client:
             raise RuntimeError("Redis not connected")
-        await self._cache_client.delete(key)
+        await self._cache_client.delete(*keys)
 
     async def cache_exists(self, key: str) -> bool:
         """Check if a key exists in cache."""
@@ -81,21 +122,71 @@ class RedisClient:
             raise RuntimeError("Redis not connected")
         return bool(await self._cache_client.exists(key))
 
+    async def cache_hget(self, key: str, field: str) -> Optional[str]:
+        """Get a raw value stored under a field of a cached hash."""
+        if not self._cache_client:
+            raise RuntimeError("Redis not connected")
+        return await self._cache_client.hget(key, field)
+
+    async def cache_hset(
+        self, key: str, field: str, value: Union[str, bytes], ttl_seconds: int = 3600
+    ) -> None:
+        """Store a raw value under a field of a cached hash.
+
+        The TTL is set when the hash is created, so every field expires with
+        it and one cache_delete() drops them all.
+        """
+        if not self._cache_client:
+            raise RuntimeError("Redis not connected")
+        async with self._cache_client.pipeline(transaction=False) as pipe:
+            pipe.hset(key, field, value)
+            pipe.expire(key, ttl_seconds, nx=True)
+            await pipe.execute()
+
+    # Leaderboards
+    async def leaderboard_add(
+        self, keys: dict[str, Optional[int]], member: str, score: float
+    ) -> None:
+        """Record a score on several leaderboards (key -> TTL, None to keep).
+
+        Each board keeps a member's best score only. All boards are written
+        in one round-trip.
+        """
+        if not self._client:
+            raise RuntimeError("Redis not connected")
+        async with self._client.pipeline(transaction=False) as pipe:
+            for key, ttl_seconds in keys.items():
+                pipe.zadd(key, {member: score}, gt=True)
+                if ttl_seconds is not None:
+                    pipe.expire(key, ttl_seconds, nx=True)
+            await pipe.execute()
+
+    async def leaderboard_top(self, key: str, limit: int) -> list[tuple[str, float]]:
+        """Highest-scoring (member, score) pairs on a leaderboard, best first."""
+        if not self._client:
+            raise RuntimeError("Redis not connected")
+        return await self._client.zrevrange(key, 0, limit - 1, withscores=True)
+
     # Queue operations
-    async def enqueue(self, queue_name: str, job_data: dict) -> str:
-        """Add a job to a queue."""
+    async def enqueue(
+        self, queue_name: str, job_data: dict, job_id: Optional[str] = None
+    ) -> str:
+        """Add a job to a queue.
+
+        Callers that already hand an id to their client can pass it as
+        ``job_id`` so get_job() finds the job under that id.
+        """
         if not self._queue_client:
             raise RuntimeError("Redis not connected")
 
-        import uuid
-        job_id = str(uuid.uuid4())
+        job_id = job_id or str(uuid.uuid4())
         job = {
             "id": job_id,
             "status": "pending",
             "data": job_data,
         }
-        await self._queue_client.lpush(queue_name, json.dumps(job))
-        await self._queue_client.set(f"job:{job_id}", json.dumps(job))
+        await self._queue_client.lpush(queue_name, dumps(job))
+        await self._queue_client.set(f"job:{job_id}", dumps(job))
         return job_id
 
     async def dequeue(self, queue_name: str, timeout: int = 0) -> Optional[dict]:
@@ -106,7 +197,7 @@ class RedisClient:
         result = await self._queue_client.brpop(queue_name, timeout=timeout)
         if result:
             _, job_data = result
-            return json.loads(job_data)
+            return orjson.loads(job_data)
         return None
 
     async def get_job(self, job_id: str) -> Optional[dict]:
@@ -116,7 +207,7 @@ class RedisClient:
 
         job_data = await self._queue_client.get(f"job:{job_id}")
         if job_data:
-            return json.loads(job_data)
+            return orjson.loads(job_data)
         return None
 
     async def update_job(self, job_id: str, status: str, result: Any = None) -> None:
@@ -129,30 +220,67 @@ class RedisClient:
             job_data["status"] = status
             if result is not None:
                 job_data["result"] = result
-            await self._queue_client.set(f"job:{job_id}", json.dumps(job_data, default=str))
+            await self._queue_client.set(f"job:{job_id}", dumps(job_data))
 
     # Rate limiting
     async def check_rate_limit(
-        self, key: str, max_requests: int, window_seconds: int
+        self, key: str, max_requests: int, window_seconds: int, admitted: int = 0
     ) -> tuple[bool, int]:
-        """Check if rate limit is exceeded. Returns (allowed, remaining)."""
+        """Check if rate limit is exceeded. Returns (allowed, remaining).
+
+        Requests are counted over a rolling window rather than fixed
+        buckets, so there is no burst at bucket boundaries. ``admitted``
+        requests that were let through without asking Redis are added to
+        the window first, so they count against the limit.
+        """
         if not self._client:
             raise RuntimeError("Redis not connected")
 
-        current = await self._client.incr(key)
-        if current == 1:
-            await self._client.expire(key, window_seconds)
+        now_ms = int(time.time() * 1000)
+        allowed, remaining = await self._rate_limit_script(
+            keys=[key],
+            args=[
+                now_ms, window_seconds * 1000, max_requests,
+                f"{now_ms}-{uuid.uuid4().hex}", admitted,
+            ],
+        )
+        return bool(allowed), int(remaining)
+
+    async def record_requests(self, counts: dict[str, int], window_seconds: int) -> None:
+        """Add requests admitted without asking Redis to their rate-limit windows.
+
+        ``counts`` maps each limit key to its number of requests; all keys
+        are written in one round-trip.
+        """
+        if not self._client:
+            raise RuntimeError("Redis not connected")
 
-        remaining = max(0, max_requests - current)
-        allowed = current <= max_requests
-        return allowed, remaining
+        now_ms = int(time.time() * 1000)
+        batch = uuid.uuid4().hex
+        async with self._client.pipeline(transaction=False) as pipe:
+            for key, count in counts.items():
+                pipe.zadd(key, {f"{now_ms}-{batch}-{i}": now_ms for i in range(count)})
+                pipe.pexpire(key, window_seconds * 1000)
+            await pipe.execute()
 
     # Pub/Sub
     async def publish(self, channel: str, message: Any) -> None:
         """Publish a message to a channel."""
         if not self._client:
             raise RuntimeError("Redis not connected")
-        await self._client.publish(channel, json.dumps(message, default=str))
+        await self._client.publish(channel, dumps(message))
+
+    async def subscribe(self, channel: str) -> AsyncIterator[Any]:
+        """Yield each message published to a channel, until the caller stops."""
+        if not self._client:
+            raise RuntimeError("Redis not connected")
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(channel)
+        try:
+            async for message in pubsub.listen():
+                yield orjson.loads(message["data"])
+        finally:
+            await pubsub.close()
 
 
 # Global Redis instance
@@ -163,6 +291,8 @@ async def get_redis() -> RedisClient:
     """Get the global Redis instance."""
     global _redis
     if _redis is None:
-        _redis = RedisClient()
-        await _redis.connect()
+        # Published only once connected, so a failed connect is retried
+        client = RedisClient()
+        await client.connect()
+        _redis = client
     return _redis
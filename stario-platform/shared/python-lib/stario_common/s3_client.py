@@ -7,8 +7,6 @@ import uuid
 from datetime import datetime, timedelta
 from typing import BinaryIO, Optional
 
-import boto3
-from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from .config import get_settings
@@ -18,6 +16,11 @@ class S3Client:
     """S3-compatible storage client (works with MinIO, AWS S3, etc.)."""
 
     def __init__(self):
+        # boto3 takes longer to import than the rest of the service put
+        # together, so it is only loaded once a client is actually needed
+        import boto3
+        from botocore.config import Config
+
         settings = get_settings()
         self._client = boto3.client(
             "s3",
@@ -28,13 +31,19 @@ class S3Client:
             config=Config(signature_version="s3v4"),
         )
         self._settings = settings
+        # Buckets already confirmed to exist, so each is checked once per
+        # process rather than with a HEAD request on every upload or presign
+        self._known_buckets: set[str] = set()
 
     def _ensure_bucket(self, bucket: str) -> None:
         """Ensure a bucket exists."""
+        if bucket in self._known_buckets:
+            return
         try:
             self._client.head_bucket(Bucket=bucket)
         except ClientError:
             self._client.create_bucket(Bucket=bucket)
+        self._known_buckets.add(bucket)
 
     def upload_file(
         self,